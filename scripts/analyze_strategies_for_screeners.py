@@ -4,9 +4,20 @@
 from __future__ import annotations
 
 import json
+import re
 import sqlite3
+import time
+from collections import Counter
+from functools import cache
+from multiprocessing import Pool
 from pathlib import Path
-from typing import Any
+from typing import Any, NamedTuple
+
+# Optional fast JSON encoder for the mapping file
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Strategy categories and their screener templates
 SCREENER_TEMPLATES = {
@@ -82,81 +93,44 @@ LIMIT_BY_CATEGORY = {
 }
 
 
-def analyze_strategy(name: str, prompt: str, theme: str | None) -> dict[str, Any]:
-    """Analyze a strategy and recommend screener configuration."""
-    name_lower = name.lower()
-    prompt_lower = (prompt or "").lower()
-    theme_lower = (theme or "").lower()
-    combined = f"{name_lower} {prompt_lower} {theme_lower}"
-
-    # Determine category and customizations
-    category = "broad_market"  # default
-    filters = {}
-    limit = 200
-    sector = None
-
-    # Priority order matters - check most specific first
-
+# Category keyword rules in priority order - most specific first. A strategy
+# takes the category of the highest-priority rule with any keyword present.
+# Spaces and hyphens within a keyword are interchangeable ("small cap" also
+# matches "small-cap"); run-together spellings are listed explicitly.
+_CATEGORY_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
     # Deep value strategies (before general value)
-    if any(
-        x in combined
-        for x in ["deep value", "cigar-butt", "cigar butt", "net-net", "liquidation", "schloss"]
-    ):
-        category = "deep_value"
-
+    (
+        "deep_value",
+        ("deep value", "cigar butt", "net-net", "liquidation", "schloss"),
+    ),
     # Growth strategies (check before value to catch growth investors)
-    elif any(
-        x in combined
-        for x in ["cathie wood", "ark invest", "growth at reasonable", "garp", "peter lynch"]
-    ):
-        category = "growth"
-
+    ("growth", ("cathie wood", "ark invest", "growth at reasonable", "garp", "peter lynch")),
     # Momentum strategies
-    elif any(x in combined for x in ["momentum", "canslim", "o'neil", "oneil", "trend following"]):
-        category = "momentum"
-
+    ("momentum", ("momentum", "canslim", "o'neil", "oneil", "trend following")),
     # Dividend strategies
-    elif any(
-        x in combined for x in ["dividend", "income", "dogs of the dow", "aristocrat", "yield"]
-    ):
-        category = "dividend"
-
+    ("dividend", ("dividend", "income", "dogs of the dow", "aristocrat", "yield")),
     # Quality/Moat (before general value)
-    elif any(
-        x in combined
-        for x in [
+    (
+        "quality",
+        (
             "quality",
             "moat",
             "sustainable competitive advantage",
             "buffett",
             "munger",
             "blue chip",
-        ]
-    ):
-        category = "quality"
-
+        ),
+    ),
     # Large cap (check before general value)
-    elif any(
-        x in combined
-        for x in ["large cap", "large-cap", "mega cap", "mega-cap", "s&p 500", "dow jones"]
-    ):
-        category = "large_cap"
-
+    ("large_cap", ("large cap", "mega cap", "s&p 500", "dow jones")),
     # Mid cap
-    elif any(x in combined for x in ["mid cap", "mid-cap"]):
-        category = "mid_cap"
-
+    ("mid_cap", ("mid cap",)),
     # Small cap
-    elif any(
-        x in combined
-        for x in ["small cap", "micro cap", "small-cap", "micro-cap", "microcap", "smallcap"]
-    ):
-        category = "small_cap"
-
+    ("small_cap", ("small cap", "micro cap", "microcap", "smallcap")),
     # Value strategies (broader catch-all)
-    elif any(
-        x in combined
-        for x in [
+    (
+        "value",
+        (
             "value",
             "graham",
             "dreman",
@@ -167,106 +141,291 @@ def analyze_strategy(name: str, prompt: str, theme: str | None) -> dict[str, Any
             "p/e ratio",
             "p/b ratio",
             "undervalued",
-        ]
-    ):
-        category = "value"
-
+        ),
+    ),
     # Risk Parity / Asset Allocation
-    elif any(
-        x in combined for x in ["risk parity", "all weather", "asset allocation", "diversified"]
-    ):
-        category = "broad_market"
+    ("broad_market", ("risk parity", "all weather", "asset allocation", "diversified")),
+)
+
+# Sector keyword rules in priority order. Consumer strategies are refined into
+# defensive or cyclical sectors by _CONSUMER_SECTOR_RULES.
+_SECTOR_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("Technology", ("technology", "tech")),
+    ("Healthcare", ("healthcare", "biotech")),
+    ("Financial Services", ("financ",)),
+    ("Energy", ("energy",)),
+    ("Consumer", ("consumer",)),
+    ("Industrials", ("industrial",)),
+    ("Real Estate", ("real estate", "reit")),
+)
+
+_CONSUMER_SECTOR_RULES: tuple[tuple[str, tuple[str, ...]], ...] = (
+    ("Consumer Defensive", ("staples",)),
+    ("Consumer Cyclical", ("discretionary", "cyclical")),
+)
+
+# Screener filters as ordered (key, value) pairs. Tuples are hashable, so the
+# rendered JSON for each distinct filter set can be cached and reused.
+Filters = tuple[tuple[str, Any], ...]
+
+_TEMPLATE_FILTERS: dict[str, Filters] = {
+    category: tuple(template.items()) for category, template in SCREENER_TEMPLATES.items()
+}
+
+
+def _keyword_pattern(keyword: str) -> str:
+    """Return a regex for ``keyword`` that accepts a space or hyphen at each break."""
+    return "[- ]".join(map(re.escape, re.split(r"[- ]", keyword)))
+
+
+def _compile_rules(rules: tuple[tuple[str, tuple[str, ...]], ...]) -> re.Pattern[str]:
+    """Compile keyword rules into one pattern with a capture group per rule.
+
+    The groups follow rule priority inside a lookahead, which also reports
+    overlapping keywords (e.g. "value" within "deep value"), so a single scan
+    finds every rule that applies.
+    """
+    alternatives = "|".join(
+        f"({'|'.join(map(_keyword_pattern, keywords))})" for _, keywords in rules
+    )
+    return re.compile(f"(?=(?:{alternatives}))")
+
+
+_CATEGORY_RE = _compile_rules(_CATEGORY_RULES)
+_SECTOR_RE = _compile_rules(_SECTOR_RULES)
+_CONSUMER_SECTOR_RE = _compile_rules(_CONSUMER_SECTOR_RULES)
+
+
+def _match_rules(
+    combined: str,
+    rules: tuple[tuple[str, tuple[str, ...]], ...],
+    pattern: re.Pattern[str],
+) -> str | None:
+    """Return the label of the highest-priority rule matching ``combined``."""
+    best = len(rules)
+    for match in pattern.finditer(combined):
+        rank = match.lastindex - 1
+        if rank < best:
+            best = rank
+            if best == 0:
+                break
+    return rules[best][0] if best < len(rules) else None
+
+
+def _detect_category(combined: str) -> str:
+    """Return the highest-priority category whose keywords occur in ``combined``."""
+    return _match_rules(combined, _CATEGORY_RULES, _CATEGORY_RE) or "broad_market"
+
+
+def _detect_sector(combined: str) -> str | None:
+    """Return the FMP sector implied by ``combined``, if any."""
+    sector = _match_rules(combined, _SECTOR_RULES, _SECTOR_RE)
+    if sector == "Consumer":
+        return _match_rules(combined, _CONSUMER_SECTOR_RULES, _CONSUMER_SECTOR_RE)
+    return sector
+
+
+class ScreenerRecommendation(NamedTuple):
+    """Recommended screener settings for one strategy."""
+
+    category: str
+    filters: Filters
+    limit: int
+    sector: str | None
+
+
+def analyze_strategy(name: str, prompt: str, theme: str | None) -> ScreenerRecommendation:
+    """Analyze a strategy and recommend screener configuration."""
+    return analyze_search_text(f"{name} {prompt or ''} {theme or ''}".lower())
+
+
+@cache
+def analyze_search_text(combined: str) -> ScreenerRecommendation:
+    """Recommend a screener configuration from lowercased strategy text.
+
+    ``combined`` is the strategy name, prompt, and theme joined by spaces and
+    lowercased, as built by :func:`analyze_strategy` or :data:`STRATEGY_QUERY`.
+    Results are memoized per text and shared between callers; filters are
+    returned as (key, value) pairs, use ``dict(filters)`` for a mapping.
+    """
+    # Determine category and customizations
+    category = _detect_category(combined)
 
     # Get base template
-    filters = dict(SCREENER_TEMPLATES[category])
+    filters = _TEMPLATE_FILTERS[category]
     limit = LIMIT_BY_CATEGORY[category]
 
     # Sector-specific customizations
-    if "technology" in combined or "tech" in combined:
-        sector = "Technology"
-    elif "healthcare" in combined or "biotech" in combined:
-        sector = "Healthcare"
-    elif "financ" in combined:
-        sector = "Financial Services"
-    elif "energy" in combined:
-        sector = "Energy"
-    elif "consumer" in combined:
-        if "staples" in combined:
-            sector = "Consumer Defensive"
-        elif "discretionary" in combined or "cyclical" in combined:
-            sector = "Consumer Cyclical"
-    elif "industrial" in combined:
-        sector = "Industrials"
-    elif "real estate" in combined or "reit" in combined:
-        sector = "Real Estate"
+    sector = _detect_sector(combined)
+    extra_filters: list[tuple[str, Any]] = []
 
     if sector:
-        filters["sector"] = sector
+        extra_filters.append(("sector", sector))
 
     # Exchange-specific
     if "nasdaq" in combined:
-        filters["exchange"] = "NASDAQ"
-
-    return {
-        "category": category,
-        "filters": filters,
-        "limit": limit,
-        "reasoning": f"Category: {category}, Sector: {sector or 'All'}",
-    }
+        extra_filters.append(("exchange", "NASDAQ"))
+
+    # Share the template unless there is something to add to it
+    if extra_filters:
+        filters += tuple(extra_filters)
+
+    return ScreenerRecommendation(category, filters, limit, sector)
+
+
+def _to_json(value: object, compact: bool = False) -> str:
+    """Encode ``value`` compactly or with the mapping file's two-space indentation."""
+    if orjson is not None:
+        option = 0 if compact else orjson.OPT_INDENT_2
+        return orjson.dumps(value, option=option).decode()
+    if compact:
+        return json.dumps(value, separators=(",", ":"))
+    return json.dumps(value, indent=2)
+
+
+def _nest(fragment: str, depth: int) -> str:
+    """Re-indent a JSON fragment embedded ``depth`` levels deep.
+
+    Compact fragments have no line breaks and pass through unchanged.
+    """
+    return fragment.replace("\n", "\n" + "  " * depth)
+
+
+# Recommendations come from a handful of templates and stored screener configs
+# from a handful more, so most rows share identical JSON. Render each distinct
+# block once and splice the cached text into every record that uses it.
+@cache
+def _recommended_screener_json(filters: Filters, limit: int, compact: bool) -> str:
+    """Render a recommended screener block once per distinct configuration."""
+    screener = {"provider": "fmp", "filters": dict(filters), "limit": limit, "enabled": True}
+    return _nest(_to_json(screener, compact), 2)
+
+
+@cache
+def _current_screener_json(current_screener: str | None, compact: bool) -> str:
+    """Re-render a strategy's stored screener JSON once per distinct text."""
+    if not current_screener:
+        return "null"
+    return _nest(_to_json(json.loads(current_screener), compact), 2)
+
+
+def _record_json(
+    strategy_id: str,
+    name: str,
+    recommendation: ScreenerRecommendation,
+    current_screener: str | None,
+    compact: bool = False,
+) -> str:
+    """Render one mapping entry exactly as ``json.dump(indent=2)`` lays it out.
+
+    With ``compact`` the entry is written on one line without whitespace.
+    """
+    category, filters, limit, sector = recommendation
+    fields = (
+        ("id", _to_json(strategy_id)),
+        ("name", _to_json(name)),
+        ("category", _to_json(category)),
+        ("recommended_screener", _recommended_screener_json(filters, limit, compact)),
+        ("current_screener", _current_screener_json(current_screener, compact)),
+        ("reasoning", _to_json(f"Category: {category}, Sector: {sector or 'All'}")),
+    )
+    if compact:
+        return "{" + ",".join(f'"{key}":{value}' for key, value in fields) + "}"
+    body = ",\n".join(f'    "{key}": {value}' for key, value in fields)
+    return "  {\n" + body + "\n  }"
+
+
+# SQLite concatenates and lowercases the searchable text while extracting it
+# from the payload, so rows arrive ready for keyword matching.
+STRATEGY_QUERY = """
+    SELECT
+        id,
+        name,
+        lower(
+            name
+            || ' ' || coalesce(json_extract(payload, '$.prompt'), '')
+            || ' ' || coalesce(json_extract(payload, '$.metadata.theme'), '')
+        ) as search_text,
+        json_extract(payload, '$.screener') as current_screener
+    FROM strategies
+    ORDER BY name
+"""
+
+
+# The analysis only reads strategies: refuse writes, memory-map the file, and
+# keep temporary structures and a larger page cache in memory.
+READ_ONLY_PRAGMAS = """
+    PRAGMA query_only = 1;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+"""
+
+
+def _analyze_parallel(texts: list[str], jobs: int) -> dict[str, ScreenerRecommendation]:
+    """Analyze distinct search texts across ``jobs`` worker processes."""
+    with Pool(jobs) as pool:
+        return dict(zip(texts, pool.map(analyze_search_text, texts, chunksize=64), strict=True))
+
+
+def _database_version(db_path: Path) -> tuple[float, ...]:
+    """Return modification times of the database and its WAL file."""
+    paths = (db_path, db_path.with_name(f"{db_path.name}-wal"))
+    return tuple(path.stat().st_mtime if path.exists() else 0.0 for path in paths)
+
+
+def run_analysis(
+    conn: sqlite3.Connection,
+    output_path: Path,
+    *,
+    jobs: int = 1,
+    compact: bool = False,
+) -> None:
+    """Analyze every strategy on ``conn`` and write the mapping to ``output_path``.
+
+    The connection is left open so repeated runs reuse it along with its cached
+    prepared statement for :data:`STRATEGY_QUERY`.
+    """
+    cursor = conn.cursor()
+    cursor.execute(STRATEGY_QUERY)
+
+    # Rows are streamed and analyzed in-process by default. With several jobs,
+    # load them up front and fan the distinct texts out to worker processes.
+    if jobs > 1:
+        rows = cursor.fetchall()
+        texts = list(dict.fromkeys(row[2] for row in rows))
+        analyze = _analyze_parallel(texts, jobs).__getitem__
+    else:
+        rows, analyze = cursor, analyze_search_text
+
+    samples = []
+    category_counts: Counter[str] = Counter()
+
+    # Stream each rendered record to a temporary file as it is analyzed, then
+    # swap it into place so readers never see a partially written mapping
+    output_path.parent.mkdir(exist_ok=True)
+    partial_path = output_path.with_name(f"{output_path.name}.partial")
+    opening, separator, closing = ("[", ",", "]") if compact else ("[\n", ",\n", "\n]")
 
+    with partial_path.open("w", encoding="utf-8") as output:
+        for strategy_id, name, search_text, current_screener in rows:
+            recommendation = analyze(search_text)
+            output.write(separator if category_counts else opening)
+            output.write(
+                _record_json(strategy_id, name, recommendation, current_screener, compact)
+            )
 
-def main() -> None:
-    """Main analysis function."""
-    db_path = Path(__file__).parent.parent / "folios_v2.db"
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+            category_counts[recommendation.category] += 1
+            if len(samples) < 5:
+                samples.append((name, recommendation))
 
-    cursor.execute("""
-        SELECT
-            id,
-            name,
-            json_extract(payload, '$.prompt') as prompt,
-            json_extract(payload, '$.metadata.theme') as theme,
-            json_extract(payload, '$.screener') as current_screener
-        FROM strategies
-        ORDER BY name
-    """)
-
-    results = []
-    category_counts = {}
-
-    for row in cursor.fetchall():
-        strategy_id, name, prompt, theme, current_screener = row
-
-        analysis = analyze_strategy(name, prompt, theme)
-        category = analysis["category"]
-        category_counts[category] = category_counts.get(category, 0) + 1
-
-        results.append({
-            "id": strategy_id,
-            "name": name,
-            "category": category,
-            "recommended_screener": {
-                "provider": "fmp",
-                "filters": analysis["filters"],
-                "limit": analysis["limit"],
-                "enabled": True,
-            },
-            "current_screener": json.loads(current_screener) if current_screener else None,
-            "reasoning": analysis["reasoning"],
-        })
-
-    conn.close()
-
-    # Write results
-    output_path = Path(__file__).parent.parent / "data" / "strategy_screener_mapping.json"
-    output_path.parent.mkdir(exist_ok=True)
+        output.write(closing if category_counts else "[]")
 
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2)
+    partial_path.replace(output_path)
+    total = category_counts.total()
 
     # Print summary
-    print(f"✓ Analyzed {len(results)} strategies")
+    print(f"✓ Analyzed {total} strategies")
     print(f"✓ Saved to {output_path}")
     print("\nCategory distribution:")
     for category, count in sorted(category_counts.items()):
@@ -274,11 +433,62 @@ def main() -> None:
 
     # Print sample recommendations
     print("\nSample recommendations:")
-    for result in results[:5]:
-        print(f"\n{result['name']}:")
-        print(f"  Category: {result['category']}")
-        print(f"  Filters: {result['recommended_screener']['filters']}")
-        print(f"  Limit: {result['recommended_screener']['limit']}")
+    for name, recommendation in samples:
+        print(f"\n{name}:")
+        print(f"  Category: {recommendation.category}")
+        print(f"  Filters: {dict(recommendation.filters)}")
+        print(f"  Limit: {recommendation.limit}")
+
+
+def main() -> None:
+    """Main analysis function."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Recommend screener configurations")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for keyword analysis (default runs in-process)",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Write the mapping without indentation (default is pretty-printed for review)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-analyze whenever the database changes",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=2.0,
+        help="Seconds between database change checks in watch mode",
+    )
+    args = parser.parse_args()
+
+    db_path = Path(__file__).parent.parent / "folios_v2.db"
+    output_path = Path(__file__).parent.parent / "data" / "strategy_screener_mapping.json"
+    conn = sqlite3.connect(db_path)
+    conn.executescript(READ_ONLY_PRAGMAS)
+
+    try:
+        version = _database_version(db_path)
+        run_analysis(conn, output_path, jobs=args.jobs, compact=args.compact)
+
+        # Watch mode keeps the connection and analysis cache warm between runs
+        while args.watch:
+            time.sleep(args.interval)
+            current = _database_version(db_path)
+            if current != version:
+                version = current
+                print("\n↻ Database changed, re-analyzing\n")
+                run_analysis(conn, output_path, jobs=args.jobs, compact=args.compact)
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        conn.close()
 
 
 if __name__ == "__main__":
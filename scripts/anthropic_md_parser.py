@@ -0,0 +1,249 @@
+"""Parser for the strategy recommendations in ANTHROPIC_RECOMMENDATIONS.md.
+
+Kept free of database and network imports and fully annotated so it can be
+compiled with mypyc (``mypyc scripts/anthropic_md_parser.py``). A compiled
+extension next to this file is imported in preference to the source, and the
+plain Python module is used otherwise.
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from decimal import Decimal
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+# Markdown patterns used by parse_recommendations_from_markdown
+_STRATEGY_HEADER_RE = re.compile(r'###\s+Strategy\s+\d+:')
+# Format 1: Multi-line structured format (e.g., 1. **INTC (Intel Corporation)**)
+_TICKER_RE = re.compile(r'\d+\.\s+\*\*([A-Z\.]+)\s+\((.+?)\)\*\*')
+# Format 2: Single-line format (e.g., 1. **USB (U.S. Bancorp)** - Current...)
+_SINGLE_LINE_RE = re.compile(
+    r'\d+\.\s+\*\*([A-Z\.]+)\s+\((.+?)\)\*\*\s+-\s+(.+?)[\.\s]+BUY\s+(\d+)%'
+)
+# Corporate raider sub-bullets (e.g., *   **KO (Coca-Cola)** - ... BUY 5%)
+_SUB_BULLET_RE = re.compile(r'\*\s+\*\*([A-Z\.]+)\s+\((.+?)\)\*\*\s+-\s+(.+?)[\.\s]+BUY\s+(\d+)%')
+# Detail bullet prefixes; position sizes are read by offset, with the pattern
+# below as the fallback for unusual layouts
+_ACTION_PREFIX = "*   **Action:**"
+_POSITION_SIZE_PREFIX = "*   **Position Size:**"
+_THESIS_PREFIX = "*   **Investment Thesis:**"
+_ACTION_RE = re.compile(r'\*\*Action:\*\*\s+(\w+)')
+_POSITION_SIZE_RE = re.compile(r'(\d+(?:\.\d+)?)-?(\d+(?:\.\d+)?)?%')
+
+
+# A recommendation's detail bullets run until one of these lines
+_DETAIL_STOP_PREFIXES = ('**Overall', '---', '##', '###', '1.', '2.', '3.', '4.')
+# The recommendations list itself ends at one of these lines
+_SECTION_END_PREFIXES = ('**Overall', '---', '## ', '### Strategy')
+
+
+@dataclass(slots=True, frozen=True)
+class Recommendation:
+    """A sized recommendation parsed from a strategy section."""
+
+    ticker: str
+    company: str
+    action: str
+    allocation_percent: float
+    allocation_fraction: Decimal
+    rationale: str
+
+
+class _ParseState(StrEnum):
+    """Where the parser is within a strategy section."""
+
+    EXPECT_RECOMMENDATIONS = "expect_recommendations"
+    IN_RECOMMENDATIONS = "in_recommendations"
+    IN_DETAILS = "in_details"
+    DONE = "done"
+
+
+def _is_decimal_number(text: str) -> bool:
+    """Return True when ``text`` is digits with an optional fractional part."""
+    whole, dot, fraction = text.partition(".")
+    return whole.isdecimal() and (not dot or fraction.isdecimal())
+
+
+def _read_position_size(detail_line: str) -> float | None:
+    """Return the percentage of a ``Position Size`` bullet, using the midpoint of a range."""
+    # Fast path: "8%" or "3-5%" directly follows the prefix
+    tail = detail_line[len(_POSITION_SIZE_PREFIX):].lstrip()
+    percent_at = tail.find("%")
+    low, dash, high = tail[:percent_at].partition("-")
+    if percent_at > 0 and _is_decimal_number(low):
+        if not dash:
+            return float(low)
+        if _is_decimal_number(high):
+            return (float(low) + float(high)) / 2
+
+    size_match = _POSITION_SIZE_RE.search(detail_line)
+    if not size_match:
+        return None
+    # Use midpoint if range, otherwise use single value
+    if size_match.group(2):
+        return (float(size_match.group(1)) + float(size_match.group(2))) / 2
+    return float(size_match.group(1))
+
+
+def _apply_detail_line(rec_data: dict[str, Any], detail_line: str) -> None:
+    """Update a multi-line recommendation from one of its detail bullets."""
+    # Extract action
+    if detail_line.startswith(_ACTION_PREFIX):
+        action_match = _ACTION_RE.search(detail_line)
+        if action_match:
+            rec_data["action"] = action_match.group(1)
+
+    # Extract position size
+    elif detail_line.startswith(_POSITION_SIZE_PREFIX):
+        allocation_percent = _read_position_size(detail_line)
+        if allocation_percent is not None:
+            rec_data["allocation_percent"] = allocation_percent
+
+    # Extract investment thesis (rationale)
+    elif detail_line.startswith(_THESIS_PREFIX):
+        thesis = detail_line.replace(_THESIS_PREFIX, "").strip()
+        rec_data["rationale"] = thesis
+
+
+def _parse_strategy_section(lines: list[str]) -> list[Recommendation]:
+    """Parse the recommendations of one strategy section in a single pass."""
+    state = _ParseState.EXPECT_RECOMMENDATIONS
+    recommendations: list[dict[str, Any] | None] = []
+    # Multi-line recommendations still collecting detail bullets, by list slot
+    open_recs: list[tuple[int, dict[str, Any]]] = []
+
+    for line in lines:
+        stripped = line.strip()
+
+        if state is _ParseState.IN_DETAILS:
+            if stripped.startswith(_DETAIL_STOP_PREFIXES):
+                # Keep only sized recommendations once their details end
+                for slot, rec_data in open_recs:
+                    if rec_data["allocation_percent"] <= 0:
+                        recommendations[slot] = None
+                open_recs.clear()
+                state = _ParseState.IN_RECOMMENDATIONS
+            else:
+                for _, rec_data in open_recs:
+                    _apply_detail_line(rec_data, stripped)
+
+        if stripped == "**Recommendations:**":
+            if state is _ParseState.EXPECT_RECOMMENDATIONS:
+                state = _ParseState.IN_RECOMMENDATIONS
+            continue
+
+        if state in (_ParseState.EXPECT_RECOMMENDATIONS, _ParseState.DONE):
+            continue
+
+        ticker_match = _TICKER_RE.match(stripped)
+        # The single-line pattern extends the ticker pattern, and its lazy groups can
+        # backtrack quadratically on long lines, so only try it when the ticker
+        # pattern fails
+        single_line_match = None if ticker_match else _SINGLE_LINE_RE.match(stripped)
+
+        if ticker_match:
+            rec_data = {
+                "ticker": ticker_match.group(1),
+                "company": ticker_match.group(2),
+                "action": "BUY",  # Default
+                "allocation_percent": 0.0,
+                "rationale": "",
+            }
+            open_recs.append((len(recommendations), rec_data))
+            recommendations.append(rec_data)
+            state = _ParseState.IN_DETAILS
+
+        elif single_line_match:
+            # Single-line format
+            recommendations.append({
+                "ticker": single_line_match.group(1),
+                "company": single_line_match.group(2),
+                "action": "BUY",
+                "allocation_percent": float(single_line_match.group(4)),
+                "rationale": single_line_match.group(3).strip(),
+            })
+
+        # Check if we've moved to next section
+        elif stripped.startswith(_SECTION_END_PREFIXES):
+            state = _ParseState.DONE
+
+        # Handle special format for corporate raider (sub-bullets)
+        elif stripped.startswith('*   **') and '(' in stripped and 'BUY' in stripped:
+            sub_match = _SUB_BULLET_RE.match(stripped)
+            if sub_match:
+                recommendations.append({
+                    "ticker": sub_match.group(1),
+                    "company": sub_match.group(2),
+                    "action": "BUY",
+                    "allocation_percent": float(sub_match.group(4)),
+                    "rationale": sub_match.group(3).strip(),
+                })
+
+    # Details still open at the end of the section close with it
+    for slot, rec_data in open_recs:
+        if rec_data["allocation_percent"] <= 0:
+            recommendations[slot] = None
+
+    return [
+        Recommendation(
+            ticker=rec_data["ticker"],
+            company=rec_data["company"],
+            action=rec_data["action"],
+            allocation_percent=rec_data["allocation_percent"],
+            # Convert once here so order sizing only has to multiply
+            allocation_fraction=Decimal(str(rec_data["allocation_percent"])) / 100,
+            rationale=rec_data["rationale"],
+        )
+        for rec_data in recommendations
+        if rec_data is not None
+    ]
+
+
+def _iter_strategy_sections(lines: Iterable[str]) -> Iterator[list[str]]:
+    """Yield each strategy section as a list of lines, starting with its name.
+
+    Text before the first strategy header is skipped, as are blank lines
+    between a header and the strategy name.
+    """
+    section: list[str] | None = None
+
+    def _append(piece: str) -> None:
+        if section:
+            section.append(piece)
+        elif section is not None and piece.strip():
+            section.append(piece.lstrip())
+
+    for raw_line in lines:
+        line = raw_line.rstrip('\n')
+        start = 0
+        for header in _STRATEGY_HEADER_RE.finditer(line):
+            _append(line[start:header.start()])
+            if section:
+                yield section
+            section = []
+            start = header.end()
+        _append(line[start:])
+
+    if section:
+        yield section
+
+
+def parse_recommendations_from_markdown(md_path: Path) -> dict[str, list[Recommendation]]:
+    """Parse recommendations from ANTHROPIC_RECOMMENDATIONS.md."""
+    strategy_recommendations: dict[str, list[Recommendation]] = {}
+
+    # Stream the file so only one strategy section is held in memory at a time
+    with md_path.open(encoding="utf-8") as fh:
+        for lines in _iter_strategy_sections(fh):
+            # Extract strategy name
+            strategy_name = lines[0].strip()
+
+            recommendations = _parse_strategy_section(lines)
+            if recommendations:
+                strategy_recommendations[strategy_name] = recommendations
+
+    return strategy_recommendations
@@ -2,22 +2,32 @@
 """Apply recommendations from ANTHROPIC_RECOMMENDATIONS.md to portfolios."""
 
 import asyncio
-import re
+import io
+import sys
+from collections.abc import Callable, Iterable
 from datetime import timedelta
-from decimal import Decimal
+from decimal import Decimal, InvalidOperation
 from pathlib import Path
+from typing import NamedTuple, TextIO
 from uuid import UUID, uuid4
 
 import typer
 
-from folios_v2.cli.deps import get_container
 from folios_v2.domain import Order, PortfolioAccount, Position
 from folios_v2.domain.enums import ProviderId
 from folios_v2.domain.trading import OrderAction, OrderStatus, PositionSide
 from folios_v2.domain.types import OrderId, PositionId, StrategyId
-from folios_v2.market_data import get_current_price
+from folios_v2.persistence.interfaces import UnitOfWork
 from folios_v2.utils import utc_now
-from folios_v2.utils.order_idempotency import add_order_if_new, build_order_idempotency_key
+from folios_v2.utils.order_idempotency import (
+    build_order_idempotency_key,
+    matches_existing_order,
+)
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from anthropic_md_parser import Recommendation, parse_recommendations_from_markdown
 
 app = typer.Typer(help="Apply Anthropic recommendations from markdown")
 
@@ -63,236 +73,116 @@ STRATEGY_MAPPING = {
 }
 
 
-def parse_recommendations_from_markdown(md_path: Path) -> dict[str, list[dict]]:
-    """Parse recommendations from ANTHROPIC_RECOMMENDATIONS.md."""
-    content = md_path.read_text()
+def _strategy_key(strategy_name: str) -> str:
+    """Normalize a strategy name so lookups tolerate case and surrounding spaces."""
+    return strategy_name.casefold().strip()
 
-    strategy_recommendations = {}
 
-    # Parse each strategy section
-    strategy_sections = re.split(r'###\s+Strategy\s+\d+:', content)
+# STRATEGY_MAPPING keyed by normalized name, with IDs parsed once
+_STRATEGY_IDS = {
+    _strategy_key(name): StrategyId(UUID(strategy_id))
+    for name, strategy_id in STRATEGY_MAPPING.items()
+}
 
-    for section in strategy_sections[1:]:  # Skip the header
-        lines = section.strip().split('\n')
+# Strategies whose recommendation is to hold cash, by normalized name
+_HOLD_CASH_STRATEGIES = frozenset({_strategy_key("Benjamin Graham Cigar Butt Strategy")})
 
-        # Extract strategy name
-        strategy_name = lines[0].strip()
+# Cap on concurrent live price lookups to avoid provider throttling
+_PRICE_FETCH_CONCURRENCY = 8
 
-        # Find recommendations section
-        in_recommendations = False
-        recommendations = []
+# Quantum for share quantities
+_CENT = Decimal("0.01")
 
-        for i, line in enumerate(lines):
-            if line.strip() == "**Recommendations:**":
-                in_recommendations = True
-                continue
+# Price used for every symbol when live prices are disabled
+_PLACEHOLDER_PRICE = Decimal("100.0")
 
-            if in_recommendations:
-                # Format 1: Multi-line structured format (e.g., 1. **INTC (Intel Corporation)**)
-                ticker_match = re.match(r'\d+\.\s+\*\*([A-Z\.]+)\s+\((.+?)\)\*\*', line.strip())
+# Markdown actions that place an order
+_ORDER_ACTIONS = {"BUY": OrderAction.BUY, "SHORT": OrderAction.SELL_SHORT}
 
-                # Format 2: Single-line format (e.g., 1. **USB (U.S. Bancorp)** - Current...)
-                single_line_match = re.match(
-                    r'\d+\.\s+\*\*([A-Z\.]+)\s+\((.+?)\)\*\*\s+-\s+(.+?)[\.\s]+BUY\s+(\d+)%',
-                    line.strip()
-                )
+class _LivePriceCache:
+    """Live prices for one run, fetched at most once per symbol.
+
+    Lookups are shared across strategies, and concurrent requests for the same
+    symbol await the same task. A failed lookup is reported in place of the
+    price for every strategy that asks for the symbol.
+    """
 
-                if ticker_match:
-                    ticker = ticker_match.group(1)
-                    company = ticker_match.group(2)
-
-                    # Extract details from following lines
-                    rec_data = {
-                        "ticker": ticker,
-                        "company": company,
-                        "action": "BUY",  # Default
-                        "allocation_percent": 0.0,
-                        "rationale": "",
-                    }
-
-                    # Look ahead for details
-                    j = i + 1
-                    while j < len(lines) and not lines[j].strip().startswith(('**Overall', '---', '##', '###', '1.', '2.', '3.', '4.')):
-                        detail_line = lines[j].strip()
-
-                        # Extract action
-                        if detail_line.startswith("*   **Action:**"):
-                            action_match = re.search(r'\*\*Action:\*\*\s+(\w+)', detail_line)
-                            if action_match:
-                                rec_data["action"] = action_match.group(1)
-
-                        # Extract position size
-                        elif detail_line.startswith("*   **Position Size:**"):
-                            size_match = re.search(r'(\d+(?:\.\d+)?)-?(\d+(?:\.\d+)?)?%', detail_line)
-                            if size_match:
-                                # Use midpoint if range, otherwise use single value
-                                if size_match.group(2):
-                                    rec_data["allocation_percent"] = (
-                                        float(size_match.group(1)) + float(size_match.group(2))
-                                    ) / 2
-                                else:
-                                    rec_data["allocation_percent"] = float(size_match.group(1))
-
-                        # Extract investment thesis (rationale)
-                        elif detail_line.startswith("*   **Investment Thesis:**"):
-                            thesis = detail_line.replace("*   **Investment Thesis:**", "").strip()
-                            rec_data["rationale"] = thesis
-
-                        j += 1
-
-                    if rec_data["allocation_percent"] > 0:
-                        recommendations.append(rec_data)
-
-                elif single_line_match:
-                    # Single-line format
-                    ticker = single_line_match.group(1)
-                    company = single_line_match.group(2)
-                    rationale = single_line_match.group(3).strip()
-                    allocation_percent = float(single_line_match.group(4))
-
-                    recommendations.append({
-                        "ticker": ticker,
-                        "company": company,
-                        "action": "BUY",
-                        "allocation_percent": allocation_percent,
-                        "rationale": rationale,
-                    })
-
-                # Check if we've moved to next section
-                elif line.strip().startswith(('**Overall', '---', '## ', '### Strategy')):
-                    break
-                # Handle special format for corporate raider (sub-bullets)
-                elif line.strip().startswith('*   **') and '(' in line and 'BUY' in line:
-                    sub_match = re.match(r'\*\s+\*\*([A-Z\.]+)\s+\((.+?)\)\*\*\s+-\s+(.+?)[\.\s]+BUY\s+(\d+)%', line.strip())
-                    if sub_match:
-                        ticker = sub_match.group(1)
-                        company = sub_match.group(2)
-                        rationale = sub_match.group(3).strip()
-                        allocation_percent = float(sub_match.group(4))
-
-                        recommendations.append({
-                            "ticker": ticker,
-                            "company": company,
-                            "action": "BUY",
-                            "allocation_percent": allocation_percent,
-                            "rationale": rationale,
-                        })
-
-        if recommendations:
-            strategy_recommendations[strategy_name] = recommendations
-
-    return strategy_recommendations
+    def __init__(self, concurrency: int = _PRICE_FETCH_CONCURRENCY) -> None:
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks: dict[str, asyncio.Task[Decimal]] = {}
+
+    async def _fetch(self, symbol: str) -> Decimal:
+        # Imported on first use: market data pulls in yfinance, which --help and
+        # placeholder-price runs should not pay for
+        from folios_v2.market_data import get_current_price
+
+        async with self._semaphore:
+            return await get_current_price(symbol)
+
+    async def get_many(self, symbols: Iterable[str]) -> dict[str, Decimal | BaseException]:
+        """Return prices keyed by symbol, or the exception raised fetching it."""
+        unique_symbols = list(dict.fromkeys(symbols))
+        for symbol in unique_symbols:
+            if symbol not in self._tasks:
+                self._tasks[symbol] = asyncio.create_task(self._fetch(symbol))
+        prices = await asyncio.gather(
+            *(self._tasks[symbol] for symbol in unique_symbols), return_exceptions=True
+        )
+        return dict(zip(unique_symbols, prices, strict=True))
 
 
 async def _initialize_portfolio_account(
+    uow: UnitOfWork,
+    out: TextIO,
     strategy_id: StrategyId,
     provider_id: ProviderId,
     initial_balance: Decimal,
 ) -> PortfolioAccount:
     """Initialize or fetch portfolio account."""
-    container = get_container()
-    async with container.unit_of_work_factory() as uow:
-        account = await uow.portfolio_repository.get(strategy_id, provider_id)
-        if account is None:
-            account = PortfolioAccount(
-                strategy_id=strategy_id,
-                provider_id=provider_id,
-                cash_balance=initial_balance,
-                equity_value=Decimal("0"),
-                updated_at=utc_now(),
-            )
-            await uow.portfolio_repository.upsert(account)
-            await uow.commit()
-            print(f"  Created portfolio account with ${initial_balance:,.2f} initial balance")
-        else:
-            print(
-                f"  Using existing portfolio: "
-                f"cash=${account.cash_balance:,.2f}, equity=${account.equity_value:,.2f}"
-            )
+    account = await uow.portfolio_repository.get(strategy_id, provider_id)
+    if account is None:
+        account = PortfolioAccount(
+            strategy_id=strategy_id,
+            provider_id=provider_id,
+            cash_balance=initial_balance,
+            equity_value=Decimal("0"),
+            updated_at=utc_now(),
+        )
+        await uow.portfolio_repository.upsert(account)
+        print(f"  Created portfolio account with ${initial_balance:,.2f} initial balance", file=out)
+    else:
+        print(
+            f"  Using existing portfolio: "
+            f"cash=${account.cash_balance:,.2f}, equity=${account.equity_value:,.2f}",
+            file=out,
+        )
     return account
 
 
-async def _execute_buy_order(
-    strategy_id: StrategyId,
-    provider_id: ProviderId,
-    symbol: str,
-    allocation_percent: float,
-    portfolio_value: Decimal,
-    current_price: Decimal,
-    rationale: str = "",
-) -> tuple[Order, Position]:
-    """Execute a BUY order and create position."""
-    # Calculate position size
-    allocation_amount = portfolio_value * Decimal(str(allocation_percent / 100))
-    quantity = (allocation_amount / current_price).quantize(Decimal("0.01"))
+class Trade(NamedTuple):
+    """An order, its position and the account changes it causes."""
 
-    # Build metadata with rationale
-    key = build_order_idempotency_key(
-        strategy_uuid,
-        provider_id,
-        symbol,
-        OrderAction.BUY,
-        quantity,
-        current_price,
-    )
-    metadata = {"idempotency_key": key}
-    if rationale:
-        metadata["rationale"] = rationale
+    order: Order
+    position: Position
+    cash_delta: Decimal
+    equity_delta: Decimal
 
-    # Create order
-    order = Order(
-        id=OrderId(uuid4()),
-        strategy_id=strategy_id,
-        provider_id=provider_id,
-        symbol=symbol,
-        action=OrderAction.BUY,
-        quantity=quantity,
-        limit_price=current_price,
-        status=OrderStatus.FILLED,
-        placed_at=utc_now(),
-        filled_at=utc_now(),
-        metadata=metadata,
-    )
 
-    # Create position
-    position = Position(
-        id=PositionId(uuid4()),
-        strategy_id=strategy_id,
-        provider_id=provider_id,
-        symbol=symbol,
-        side=PositionSide.LONG,
-        quantity=quantity,
-        average_price=current_price,
-        opened_at=utc_now(),
-    )
-
-    return order, position
-
-
-async def _execute_short_order(
+def _build_trade(
+    action: OrderAction,
     strategy_id: StrategyId,
     provider_id: ProviderId,
     symbol: str,
-    allocation_percent: float,
-    portfolio_value: Decimal,
+    quantity: Decimal,
     current_price: Decimal,
+    idempotency_key: str,
     rationale: str = "",
-) -> tuple[Order, Position]:
-    """Execute a SELL_SHORT order and create short position."""
-    # Calculate position size
-    allocation_amount = portfolio_value * Decimal(str(allocation_percent / 100))
-    quantity = (allocation_amount / current_price).quantize(Decimal("0.01"))
+) -> Trade:
+    """Build a BUY or SELL_SHORT order, the matching position and its account deltas."""
+    now = utc_now()
 
     # Build metadata with rationale
-    key = build_order_idempotency_key(
-        strategy_uuid,
-        provider_id,
-        symbol,
-        OrderAction.SELL_SHORT,
-        quantity,
-        current_price,
-    )
-    metadata = {"idempotency_key": key}
+    metadata = {"idempotency_key": idempotency_key}
     if rationale:
         metadata["rationale"] = rationale
 
@@ -302,204 +192,204 @@ async def _execute_short_order(
         strategy_id=strategy_id,
         provider_id=provider_id,
         symbol=symbol,
-        action=OrderAction.SELL_SHORT,
+        action=action,
         quantity=quantity,
         limit_price=current_price,
         status=OrderStatus.FILLED,
-        placed_at=utc_now(),
-        filled_at=utc_now(),
+        placed_at=now,
+        filled_at=now,
         metadata=metadata,
     )
 
-    # Create short position
+    # Create a long position for buys, a short position for short sales
     position = Position(
         id=PositionId(uuid4()),
         strategy_id=strategy_id,
         provider_id=provider_id,
         symbol=symbol,
-        side=PositionSide.SHORT,
+        side=PositionSide.LONG if action == OrderAction.BUY else PositionSide.SHORT,
         quantity=quantity,
         average_price=current_price,
-        opened_at=utc_now(),
+        opened_at=now,
     )
 
-    return order, position
+    # For longs: we spend cash to buy (negative), equity increases (positive)
+    # For shorts: we receive cash proceeds (positive), equity decreases (negative liability)
+    value = quantity * current_price
+    if action == OrderAction.BUY:
+        return Trade(order, position, cash_delta=-value, equity_delta=value)
+    return Trade(order, position, cash_delta=value, equity_delta=-value)
 
 
 async def _apply_strategy_recommendations(
+    uow: UnitOfWork,
+    out: TextIO,
     strategy_name: str,
-    strategy_id: str,
-    recommendations: list[dict],
+    strategy_id: StrategyId,
+    recommendations: list[Recommendation],
     initial_balance: Decimal,
-    use_live_prices: bool,
+    price_cache: _LivePriceCache | None,
 ) -> dict:
-    """Apply recommendations for a single strategy."""
-    print(f"\n{'='*80}")
-    print(f"Strategy: {strategy_name}")
-    print(f"Strategy ID: {strategy_id}")
-    print(f"Recommendations: {len(recommendations)}")
-    print(f"{'='*80}")
+    """Apply recommendations for a single strategy within ``uow``.
+
+    The caller commits, so several strategies can share one transaction.
+    Progress lines go to ``out`` for the caller to write in one piece.
+    """
+    print(f"\n{'='*80}", file=out)
+    print(f"Strategy: {strategy_name}", file=out)
+    print(f"Strategy ID: {strategy_id}", file=out)
+    print(f"Recommendations: {len(recommendations)}", file=out)
+    print(f"{'='*80}", file=out)
 
     provider_id = ProviderId.ANTHROPIC
-    strategy_uuid = StrategyId(UUID(strategy_id))
 
     # Initialize portfolio
     account = await _initialize_portfolio_account(
-        strategy_uuid,
+        uow,
+        out,
+        strategy_id,
         provider_id,
         initial_balance,
     )
 
     portfolio_value = account.cash_balance + account.equity_value
 
-    # Process recommendations
-    orders_created = []
-    positions_created = []
-    container = get_container()
-
-    lookback_cutoff = utc_now() - timedelta(days=7)
-
-    async with container.unit_of_work_factory() as uow:
-        for rec in recommendations:
-            symbol = rec["ticker"]
-            action = rec["action"]
-            allocation_percent = rec["allocation_percent"]
-            rationale = rec.get("rationale", "")
-
-            print(f"\n  Processing {symbol}: {action} ({allocation_percent}% allocation)")
-
-            if action == "BUY":
-                # Get live price
-                if use_live_prices:
-                    try:
-                        current_price = await get_current_price(symbol)
-                        print(f"    Live price: ${current_price}")
-                    except Exception as e:
-                        print(f"    ERROR: Failed to fetch live price for {symbol}: {e}")
-                        print(f"    Skipping {symbol}")
-                        continue
-                else:
-                    # Use placeholder price for dry-run
-                    current_price = Decimal("100.0")
-                    print(f"    Using placeholder price: ${current_price}")
-
-                order, position = await _execute_buy_order(
-                    strategy_uuid,
-                    provider_id,
-                    symbol,
-                    allocation_percent,
-                    portfolio_value,
-                    current_price,
-                    rationale,
-                )
-
-                added = await add_order_if_new(
-                    uow.order_repository,
-                    order,
-                    lookback_cutoff=lookback_cutoff,
-                )
-                if not added:
-                    print("    ⚠️  Duplicate BUY detected; skipping order/position")
-                    continue
-
-                await uow.position_repository.add(position)
-
-                orders_created.append(order)
-                positions_created.append(position)
-
-                cost = order.quantity * order.limit_price
-                print(f"    ✓ BUY: {order.quantity} shares @ ${order.limit_price} = ${cost:,.2f}")
-
-            elif action == "SHORT":
-                # Get live price
-                if use_live_prices:
-                    try:
-                        current_price = await get_current_price(symbol)
-                        print(f"    Live price: ${current_price}")
-                    except Exception as e:
-                        print(f"    ERROR: Failed to fetch live price for {symbol}: {e}")
-                        print(f"    Skipping {symbol}")
-                        continue
-                else:
-                    # Use placeholder price for dry-run
-                    current_price = Decimal("100.0")
-                    print(f"    Using placeholder price: ${current_price}")
-
-                order, position = await _execute_short_order(
-                    strategy_uuid,
-                    provider_id,
-                    symbol,
-                    allocation_percent,
-                    portfolio_value,
-                    current_price,
-                    rationale,
-                )
+    # Process recommendations; orders and positions are written in bulk afterwards
+    orders_created: list[Order] = []
+    positions_created: list[Position] = []
+
+    # Load the strategy's recent orders once and dedupe against them in memory.
+    # Orders created earlier in this loop join both ``seen_keys`` and ``recent_orders``,
+    # so near-identical repeats within one run are caught too. Strategies with only
+    # HOLD (or unknown) actions place no orders and skip the query.
+    order_symbols = [rec.ticker for rec in recommendations if rec.action in _ORDER_ACTIONS]
+    recent_orders: list[Order] = []
+    if order_symbols:
+        lookback_cutoff = utc_now() - timedelta(days=7)
+        recent_orders = [
+            existing
+            for existing in await uow.order_repository.list_recent(
+                strategy_id,
+                limit=250,
+                provider_id=provider_id,
+            )
+            if not (existing.placed_at and existing.placed_at < lookback_cutoff)
+        ]
+    seen_keys = {
+        existing.metadata["idempotency_key"]
+        for existing in recent_orders
+        if isinstance(existing.metadata, dict) and existing.metadata.get("idempotency_key")
+    }
 
-                added = await add_order_if_new(
-                    uow.order_repository,
-                    order,
-                    lookback_cutoff=lookback_cutoff,
-                )
-                if not added:
-                    print("    ⚠️  Duplicate SHORT detected; skipping order/position")
-                    continue
+    # Running totals of the trades' account deltas
+    total_cash_delta = total_equity_delta = Decimal("0")
 
-                await uow.position_repository.add(position)
+    # Fetch every live price the strategy needs up front, concurrently
+    live_prices: dict[str, Decimal | BaseException] = {}
+    if price_cache is not None and order_symbols:
+        live_prices = await price_cache.get_many(order_symbols)
 
-                orders_created.append(order)
-                positions_created.append(position)
+    for rec in recommendations:
+        symbol = rec.ticker
+        action = rec.action
+        allocation_percent = rec.allocation_percent
+        rationale = rec.rationale
 
-                proceeds = order.quantity * order.limit_price
-                print(f"    ✓ SHORT: {order.quantity} shares @ ${order.limit_price} = ${proceeds:,.2f}")
+        print(f"\n  Processing {symbol}: {action} ({allocation_percent}% allocation)", file=out)
 
-            elif action == "HOLD":
-                print("    ⏸️  HOLD - no action taken")
+        if action == "HOLD":
+            print("    ⏸️  HOLD - no action taken", file=out)
+            continue
+        order_action = _ORDER_ACTIONS.get(action)
+        if order_action is None:
+            continue
 
-        # Update portfolio account
-        # For longs: we spend cash to buy (negative), equity increases (positive)
-        total_long_cost = sum(
-            order.quantity * order.limit_price
-            for order in orders_created
-            if order.action == OrderAction.BUY
-        )
-        total_long_equity = sum(
-            position.quantity * position.average_price
-            for position in positions_created
-            if position.side == PositionSide.LONG
+        # Get live price
+        if price_cache is not None:
+            current_price = live_prices[symbol]
+            if isinstance(current_price, BaseException):
+                print(
+                    f"    ERROR: Failed to fetch live price for {symbol}: {current_price}",
+                    file=out,
+                )
+                print(f"    Skipping {symbol}", file=out)
+                continue
+            print(f"    Live price: ${current_price}", file=out)
+        else:
+            # Use placeholder price for dry-run
+            current_price = _PLACEHOLDER_PRICE
+            print(f"    Using placeholder price: ${current_price}", file=out)
+
+        # Calculate position size
+        quantity = (portfolio_value * rec.allocation_fraction / current_price).quantize(_CENT)
+
+        # Reject exact repeats by key before building any domain objects
+        key = build_order_idempotency_key(
+            strategy_id,
+            provider_id,
+            symbol,
+            order_action,
+            quantity,
+            current_price,
         )
+        if key in seen_keys:
+            print(f"    ⚠️  Duplicate {action} detected; skipping order/position", file=out)
+            continue
 
-        # For shorts: we receive cash proceeds (positive), equity decreases (negative liability)
-        total_short_proceeds = sum(
-            order.quantity * order.limit_price
-            for order in orders_created
-            if order.action == OrderAction.SELL_SHORT
-        )
-        total_short_equity = sum(
-            position.quantity * position.average_price
-            for position in positions_created
-            if position.side == PositionSide.SHORT
+        trade = _build_trade(
+            order_action,
+            strategy_id,
+            provider_id,
+            symbol,
+            quantity,
+            current_price,
+            key,
+            rationale,
         )
 
-        updated_account = account.model_copy(
-            update={
-                "cash_balance": account.cash_balance - total_long_cost + total_short_proceeds,
-                "equity_value": account.equity_value + total_long_equity - total_short_equity,
-                "updated_at": utc_now(),
-            }
+        order = trade.order
+        if matches_existing_order(order, recent_orders):
+            print(f"    ⚠️  Duplicate {action} detected; skipping order/position", file=out)
+            continue
+        seen_keys.add(key)
+        recent_orders.append(order)
+
+        orders_created.append(order)
+        positions_created.append(trade.position)
+        total_cash_delta += trade.cash_delta
+        total_equity_delta += trade.equity_delta
+
+        value = trade.cash_delta.copy_abs()
+        print(
+            f"    ✓ {action}: {order.quantity} shares @ ${order.limit_price} = ${value:,.2f}",
+            file=out,
         )
-        await uow.portfolio_repository.upsert(updated_account)
-        await uow.commit()
 
-    # Summary
-    print("\n  Summary:")
-    print(f"    Orders: {len(orders_created)}")
-    print(f"    Positions: {len(positions_created)}")
-    print(f"    Cash: ${updated_account.cash_balance:,.2f}")
-    print(f"    Equity: ${updated_account.equity_value:,.2f}")
-    print(f"    Total: ${updated_account.cash_balance + updated_account.equity_value:,.2f}")
+    await uow.order_repository.add_many(orders_created)
+    await uow.position_repository.add_many(positions_created)
+
+    # Update portfolio account
+    updated_account = account.model_copy(
+        update={
+            "cash_balance": account.cash_balance + total_cash_delta,
+            "equity_value": account.equity_value + total_equity_delta,
+            "updated_at": utc_now(),
+        }
+    )
+    await uow.portfolio_repository.upsert(updated_account)
 
-    # Calculate net capital deployed (long cost - short proceeds)
-    net_capital_deployed = total_long_cost - total_short_proceeds
+    # Summary
+    print("\n  Summary:", file=out)
+    print(f"    Orders: {len(orders_created)}", file=out)
+    print(f"    Positions: {len(positions_created)}", file=out)
+    print(f"    Cash: ${updated_account.cash_balance:,.2f}", file=out)
+    print(f"    Equity: ${updated_account.equity_value:,.2f}", file=out)
+    total_value = updated_account.cash_balance + updated_account.equity_value
+    print(f"    Total: ${total_value:,.2f}", file=out)
+
+    # Calculate net capital deployed (long cost - short proceeds); subtracting
+    # from zero avoids reporting -0 when nothing was traded
+    net_capital_deployed = 0 - total_cash_delta
 
     return {
         "strategy_name": strategy_name,
@@ -512,10 +402,67 @@ async def _apply_strategy_recommendations(
     }
 
 
+async def _apply_strategy_batch(
+    uow_factory: Callable[[], UnitOfWork],
+    batch: list[tuple[str, StrategyId, list[Recommendation]]],
+    initial_balance: Decimal,
+    price_cache: _LivePriceCache | None,
+) -> list[dict]:
+    """Apply several strategies in one unit of work with a single commit."""
+    summaries = []
+    async with uow_factory() as uow:
+        for strategy_name, strategy_id, recommendations in batch:
+            # Buffer the strategy's progress lines and write them in one go,
+            # including when it fails part way through
+            out = io.StringIO()
+            try:
+                summary = await _apply_strategy_recommendations(
+                    uow,
+                    out,
+                    strategy_name,
+                    strategy_id,
+                    recommendations,
+                    initial_balance,
+                    price_cache,
+                )
+            finally:
+                sys.stdout.write(out.getvalue())
+                sys.stdout.flush()
+            summaries.append(summary)
+        await uow.commit()
+    return summaries
+
+
+async def _apply_strategies_individually(
+    uow_factory: Callable[[], UnitOfWork],
+    batch: list[tuple[str, StrategyId, list[Recommendation]]],
+    initial_balance: Decimal,
+    price_cache: _LivePriceCache | None,
+) -> list[dict]:
+    """Apply each strategy in its own unit of work, reporting failures."""
+    summaries = []
+    for strategy_name, strategy_id, recommendations in batch:
+        try:
+            summaries.extend(
+                await _apply_strategy_batch(
+                    uow_factory,
+                    [(strategy_name, strategy_id, recommendations)],
+                    initial_balance,
+                    price_cache,
+                )
+            )
+        except Exception as e:
+            print(f"\n❌ Error applying {strategy_name}: {e}")
+            import traceback
+            traceback.print_exc()
+    return summaries
+
+
 async def _apply_all_recommendations(
     md_path: Path,
-    initial_balance: float,
+    initial_balance: Decimal,
     use_live_prices: bool,
+    strategies_per_commit: int,
 ) -> None:
     """Apply all recommendations from markdown."""
     print(f"\n{'='*80}")
@@ -530,34 +477,72 @@ async def _apply_all_recommendations(
     strategy_recommendations = parse_recommendations_from_markdown(md_path)
     print(f"Found {len(strategy_recommendations)} strategies with recommendations")
 
-    initial_balance_decimal = Decimal(str(initial_balance))
+    # Imported here: building the CLI container imports every provider SDK
+    from folios_v2.cli.deps import get_container
 
-    # Process each strategy
-    summaries = []
+    # Resolve the container once per run; every batch opens its unit of work from it
+    uow_factory = get_container().unit_of_work_factory
+    # Placeholder prices are used when live prices are disabled
+    price_cache = _LivePriceCache() if use_live_prices else None
+
+    # Resolve which strategies to apply
+    runnable = []
     for strategy_name, recommendations in strategy_recommendations.items():
-        strategy_id = STRATEGY_MAPPING.get(strategy_name)
+        strategy_key = _strategy_key(strategy_name)
+        strategy_id = _STRATEGY_IDS.get(strategy_key)
 
         if not strategy_id:
             print(f"\n⏭️  Skipping {strategy_name} - no strategy ID mapping found")
             continue
 
-        if strategy_name == "Benjamin Graham Cigar Butt Strategy":
+        if strategy_key in _HOLD_CASH_STRATEGIES:
             print(f"\n⏭️  Skipping {strategy_name} - HOLD CASH recommendation")
             continue
 
+        runnable.append((strategy_name, strategy_id, recommendations))
+
+    # Strategies are written one after another, but their live prices are fetched
+    # together up front so no strategy waits on the network
+    if price_cache is not None:
+        symbols = {
+            rec.ticker
+            for _, _, recommendations in runnable
+            for rec in recommendations
+            if rec.action in _ORDER_ACTIONS
+        }
+        print(f"\nFetching live prices for {len(symbols)} symbols...")
+        prices = await price_cache.get_many(sorted(symbols))
+        failed = [symbol for symbol, price in prices.items() if isinstance(price, BaseException)]
+        if failed:
+            print(f"⚠️  No live price for {len(failed)} symbols: {', '.join(failed)}")
+
+    # Process strategies in batches that share one unit of work and commit
+    summaries = []
+    for start in range(0, len(runnable), strategies_per_commit):
+        batch = runnable[start:start + strategies_per_commit]
+        if len(batch) == 1:
+            summaries.extend(
+                await _apply_strategies_individually(
+                    uow_factory, batch, initial_balance, price_cache
+                )
+            )
+            continue
+
         try:
-            summary = await _apply_strategy_recommendations(
-                strategy_name,
-                strategy_id,
-                recommendations,
-                initial_balance_decimal,
-                use_live_prices,
+            summaries.extend(
+                await _apply_strategy_batch(
+                    uow_factory, batch, initial_balance, price_cache
+                )
             )
-            summaries.append(summary)
         except Exception as e:
-            print(f"\n❌ Error applying {strategy_name}: {e}")
-            import traceback
-            traceback.print_exc()
+            # Isolate the failure so the rest of the batch still applies
+            print(f"\n❌ Error applying commit batch: {e}")
+            print("   Rolled back the batch; retrying its strategies one per commit")
+            summaries.extend(
+                await _apply_strategies_individually(
+                    uow_factory, batch, initial_balance, price_cache
+                )
+            )
 
     # Final summary
     print(f"\n{'='*80}")
@@ -575,14 +560,32 @@ async def _apply_all_recommendations(
     print(f"{'='*80}")
 
 
+def _parse_decimal(value: str) -> Decimal:
+    """Parse a CLI amount straight to Decimal, without going through float."""
+    try:
+        return Decimal(value)
+    except InvalidOperation as exc:
+        raise typer.BadParameter(f"{value!r} is not a number") from exc
+
+
 @app.command()
 def run(
     md_file: str = typer.Argument(
         "ANTHROPIC_RECOMMENDATIONS.md",
         help="Path to markdown file with recommendations"
     ),
-    initial_balance: float = typer.Option(100000.0, help="Initial balance per strategy"),
+    initial_balance: Decimal = typer.Option(  # noqa: B008
+        "100000.0",
+        parser=_parse_decimal,
+        metavar="DECIMAL",
+        help="Initial balance per strategy",
+    ),
     live_prices: bool = typer.Option(True, help="Use live market prices from Yahoo Finance"),
+    strategies_per_commit: int = typer.Option(
+        8,
+        min=1,
+        help="Strategies applied per database commit (a failure rolls back its batch)",
+    ),
 ) -> None:
     """Apply Anthropic recommendations from markdown to strategy portfolios."""
     md_path = Path(md_file)
@@ -590,7 +593,9 @@ def run(
         typer.echo(f"Error: File not found: {md_file}", err=True)
         raise typer.Exit(code=1)
 
-    asyncio.run(_apply_all_recommendations(md_path, initial_balance, live_prices))
+    asyncio.run(
+        _apply_all_recommendations(md_path, initial_balance, live_prices, strategies_per_commit)
+    )
 
 
 if __name__ == "__main__":
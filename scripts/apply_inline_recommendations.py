@@ -2,10 +2,14 @@
 """Apply inline recommendations to strategy portfolios."""
 
 import asyncio
+import io
 import json
-from datetime import timedelta
+import sys
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
 from decimal import Decimal
 from pathlib import Path
+from typing import TextIO
 from uuid import UUID, uuid4
 
 import typer
@@ -15,8 +19,9 @@ from folios_v2.domain import Order, PortfolioAccount, Position
 from folios_v2.domain.enums import ProviderId
 from folios_v2.domain.trading import OrderAction, OrderStatus, PositionSide
 from folios_v2.domain.types import OrderId, PositionId, StrategyId
+from folios_v2.persistence.interfaces import UnitOfWork
 from folios_v2.utils import utc_now
-from folios_v2.utils.order_idempotency import add_order_if_new, build_order_idempotency_key
+from folios_v2.utils.order_idempotency import build_order_idempotency_key, matches_existing_order
 
 # Optional import for live prices
 try:
@@ -24,57 +29,108 @@ try:
 except ImportError:
     get_current_price = None
 
+# Optional fast JSON decoder for the results file
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 app = typer.Typer(help="Apply inline recommendations to portfolios")
 
+# Recommendation actions that place an order, and the cap on concurrent live price lookups
+_ORDER_ACTIONS = {"BUY": OrderAction.BUY, "SELL": OrderAction.SELL}
+_PRICE_FETCH_CONCURRENCY = 8
+
+# Price used when a recommendation has no price of its own
+_DEFAULT_PRICE = Decimal("100.0")
+
+
+def _to_decimal(value: float | int | str) -> Decimal:
+    """Convert a JSON number or numeric string to Decimal.
+
+    Ints and strings convert exactly as they are; floats go through ``str`` so the
+    shortest repr (``187.33``) is kept rather than the binary expansion.
+    """
+    if isinstance(value, int | str):
+        return Decimal(value)
+    return Decimal(str(value))
+
+
+def _recommendation_price(rec: dict) -> Decimal:
+    """Return the price given in a recommendation, or the default when it has none."""
+    if "price" not in rec:
+        return _DEFAULT_PRICE
+    return _to_decimal(rec["price"])
+
+
+async def _fetch_live_prices(symbols: Iterable[str]) -> dict[str, Decimal | BaseException]:
+    """Fetch live prices concurrently, keyed by symbol, with the exception for failures."""
+    semaphore = asyncio.Semaphore(_PRICE_FETCH_CONCURRENCY)
+
+    async def _fetch(symbol: str) -> Decimal:
+        async with semaphore:
+            return await get_current_price(symbol)
+
+    unique_symbols = list(dict.fromkeys(symbols))
+    prices = await asyncio.gather(
+        *(_fetch(symbol) for symbol in unique_symbols), return_exceptions=True
+    )
+    return dict(zip(unique_symbols, prices, strict=True))
+
+
+def _trade_symbols(recommendations: list[dict]) -> Iterable[str]:
+    """Yield the symbols of recommendations that will place a BUY or SELL order."""
+    for rec in recommendations:
+        if (
+            rec.get("ticker")
+            and rec.get("shares", 0) != 0
+            and rec.get("action", "").upper() in _ORDER_ACTIONS
+        ):
+            yield rec["ticker"]
+
 
 async def _initialize_portfolio_account(
+    uow: UnitOfWork,
+    out: TextIO,
     strategy_id: StrategyId,
     provider_id: ProviderId,
     initial_balance: Decimal,
+    now: datetime,
 ) -> PortfolioAccount:
     """Initialize or fetch portfolio account."""
-    container = get_container()
-    async with container.unit_of_work_factory() as uow:
-        account = await uow.portfolio_repository.get(strategy_id, provider_id)
-        if account is None:
-            account = PortfolioAccount(
-                strategy_id=strategy_id,
-                provider_id=provider_id,
-                cash_balance=initial_balance,
-                equity_value=Decimal("0"),
-                updated_at=utc_now(),
-            )
-            await uow.portfolio_repository.upsert(account)
-            await uow.commit()
-            print(f"  Created portfolio account with ${initial_balance:,.2f} initial balance")
-        else:
-            print(
-                f"  Using existing portfolio: "
-                f"cash=${account.cash_balance:,.2f}, equity=${account.equity_value:,.2f}"
-            )
+    account = await uow.portfolio_repository.get(strategy_id, provider_id)
+    if account is None:
+        account = PortfolioAccount(
+            strategy_id=strategy_id,
+            provider_id=provider_id,
+            cash_balance=initial_balance,
+            equity_value=Decimal("0"),
+            updated_at=now,
+        )
+        await uow.portfolio_repository.upsert(account)
+        print(f"  Created portfolio account with ${initial_balance:,.2f} initial balance", file=out)
+    else:
+        print(
+            f"  Using existing portfolio: "
+            f"cash=${account.cash_balance:,.2f}, equity=${account.equity_value:,.2f}",
+            file=out,
+        )
     return account
 
 
-async def _execute_buy_order(
+def _build_order_and_position(
+    action: OrderAction,
     strategy_id: StrategyId,
     provider_id: ProviderId,
     symbol: str,
-    shares: int,
+    quantity: Decimal,
     current_price: Decimal,
+    key: str,
+    now: datetime,
     rationale: str = "",
 ) -> tuple[Order, Position]:
-    """Execute a BUY order and create/update position."""
-    quantity = Decimal(str(shares))
-
+    """Build a filled BUY or SELL order and the long or short position it opens."""
     # Build metadata with rationale
-    key = build_order_idempotency_key(
-        strategy_id,
-        provider_id,
-        symbol,
-        OrderAction.BUY,
-        quantity,
-        current_price,
-    )
     metadata = {"idempotency_key": key}
     if rationale:
         metadata["rationale"] = rationale
@@ -85,118 +141,95 @@ async def _execute_buy_order(
         strategy_id=strategy_id,
         provider_id=provider_id,
         symbol=symbol,
-        action=OrderAction.BUY,
-        quantity=quantity,
-        limit_price=current_price,
-        status=OrderStatus.FILLED,
-        placed_at=utc_now(),
-        filled_at=utc_now(),
-        metadata=metadata,
-    )
-
-    # Create position
-    position = Position(
-        id=PositionId(uuid4()),
-        strategy_id=strategy_id,
-        provider_id=provider_id,
-        symbol=symbol,
-        side=PositionSide.LONG,
-        quantity=quantity,
-        average_price=current_price,
-        opened_at=utc_now(),
-    )
-
-    return order, position
-
-
-async def _execute_sell_order(
-    strategy_id: StrategyId,
-    provider_id: ProviderId,
-    symbol: str,
-    shares: int,
-    current_price: Decimal,
-    rationale: str = "",
-) -> Order:
-    """Execute a SELL order (short position)."""
-    quantity = Decimal(str(abs(shares)))
-
-    # Build metadata with rationale
-    key = build_order_idempotency_key(
-        strategy_id,
-        provider_id,
-        symbol,
-        OrderAction.SELL,
-        quantity,
-        current_price,
-    )
-    metadata = {"idempotency_key": key}
-    if rationale:
-        metadata["rationale"] = rationale
-
-    # Create sell order
-    order = Order(
-        id=OrderId(uuid4()),
-        strategy_id=strategy_id,
-        provider_id=provider_id,
-        symbol=symbol,
-        action=OrderAction.SELL,
+        action=action,
         quantity=quantity,
         limit_price=current_price,
         status=OrderStatus.FILLED,
-        placed_at=utc_now(),
-        filled_at=utc_now(),
+        placed_at=now,
+        filled_at=now,
         metadata=metadata,
     )
 
-    # Create short position
+    # Create a long position for buys, a short position for sells
     position = Position(
         id=PositionId(uuid4()),
         strategy_id=strategy_id,
         provider_id=provider_id,
         symbol=symbol,
-        side=PositionSide.SHORT,
+        side=PositionSide.LONG if action == OrderAction.BUY else PositionSide.SHORT,
         quantity=quantity,
         average_price=current_price,
-        opened_at=utc_now(),
+        opened_at=now,
     )
 
     return order, position
 
 
 async def _apply_strategy_recommendations(
+    uow_factory: Callable[[], UnitOfWork],
+    out: TextIO,
     strategy_result: dict,
     initial_balance: Decimal,
-    use_live_prices: bool,
+    live_prices: dict[str, Decimal | BaseException],
 ) -> dict:
-    """Apply recommendations for a single strategy."""
+    """Apply recommendations for a single strategy.
+
+    ``live_prices`` holds the prefetched live price (or lookup error) per symbol;
+    symbols missing from it use the recommendation's price.
+    """
     strategy_id = StrategyId(UUID(strategy_result["strategy_id"]))
     strategy_name = strategy_result["strategy_name"]
     recommendations = strategy_result["recommendations"]
 
-    print(f"\n{'='*80}")
-    print(f"Applying: {strategy_name}")
-    print(f"Strategy ID: {strategy_id}")
-    print(f"Recommendations: {len(recommendations)}")
-    print(f"{'='*80}")
+    print(f"\n{'='*80}", file=out)
+    print(f"Applying: {strategy_name}", file=out)
+    print(f"Strategy ID: {strategy_id}", file=out)
+    print(f"Recommendations: {len(recommendations)}", file=out)
+    print(f"{'='*80}", file=out)
 
     # Use claude_inline as provider
     provider_id = ProviderId.ANTHROPIC
 
-    # Initialize portfolio
-    account = await _initialize_portfolio_account(
-        strategy_id,
-        provider_id,
-        initial_balance,
-    )
-
-    # Process recommendations
+    # Process recommendations; orders and positions are written in bulk afterwards
     orders_created = []
     positions_created = []
-    container = get_container()
 
-    lookback_cutoff = utc_now() - timedelta(days=7)
+    # One timestamp for the whole strategy: its orders, positions and account update
+    now = utc_now()
+    lookback_cutoff = now - timedelta(days=7)
+
+    async with uow_factory() as uow:
+        # Initialize portfolio in the same transaction as the orders
+        account = await _initialize_portfolio_account(
+            uow,
+            out,
+            strategy_id,
+            provider_id,
+            initial_balance,
+            now,
+        )
+
+        # Load the strategy's recent orders once and dedupe against them in memory.
+        # ``seen_keys`` answers exact repeats with a set lookup; orders created below
+        # are added to both so repeats within the file are caught too.
+        known_orders = [
+            existing
+            for existing in await uow.order_repository.list_recent(
+                strategy_id,
+                limit=250,
+                provider_id=provider_id,
+            )
+            if not (existing.placed_at and existing.placed_at < lookback_cutoff)
+        ]
+        seen_keys = {
+            existing.metadata["idempotency_key"]
+            for existing in known_orders
+            if isinstance(existing.metadata, dict) and existing.metadata.get("idempotency_key")
+        }
+
+        # Running totals of the accepted orders
+        total_cost = total_proceeds = total_equity = Decimal("0")
 
-    async with container.unit_of_work_factory() as uow:
         for rec in recommendations:
             symbol = rec.get("ticker")
             action = rec.get("action", "").upper()
@@ -204,104 +237,91 @@ async def _apply_strategy_recommendations(
             rationale = rec.get("rationale", "")
 
             if not symbol or shares == 0:
-                print(f"  ⏭️  Skipping {symbol} - {action} (0 shares)")
+                print(f"  ⏭️  Skipping {symbol} - {action} (0 shares)", file=out)
                 continue
 
-            print(f"\n  Processing {symbol}: {action} ({shares} shares)")
+            print(f"\n  Processing {symbol}: {action} ({shares} shares)", file=out)
+
+            if action == "HOLD":
+                print("    ⏸️  HOLD - no action taken", file=out)
+                continue
+            if action not in _ORDER_ACTIONS:
+                continue
 
             # Get price
-            if use_live_prices and get_current_price is not None:
-                try:
-                    current_price = await get_current_price(symbol)
-                    print(f"    Live price: ${current_price}")
-                except ValueError as e:
-                    print(f"    ⚠️  Error fetching price: {e}")
-                    # Fallback to recommendation price if available
-                    current_price = Decimal(str(rec.get("price", 100.0)))
-                    print(f"    Using recommendation price: ${current_price}")
+            live_price = live_prices.get(symbol)
+            if isinstance(live_price, ValueError):
+                print(f"    ⚠️  Error fetching price: {live_price}", file=out)
+                # Fallback to recommendation price if available
+                current_price = _recommendation_price(rec)
+                print(f"    Using recommendation price: ${current_price}", file=out)
+            elif isinstance(live_price, BaseException):
+                raise live_price
+            elif live_price is not None:
+                current_price = live_price
+                print(f"    Live price: ${current_price}", file=out)
             else:
-                current_price = Decimal(str(rec.get("price", 100.0)))
-                print(f"    Using recommendation price: ${current_price}")
-
-            if action == "BUY":
-                order, position = await _execute_buy_order(
-                    strategy_id,
-                    provider_id,
-                    symbol,
-                    shares,
-                    current_price,
-                    rationale,
-                )
-
-                added = await add_order_if_new(
-                    uow.order_repository,
-                    order,
-                    lookback_cutoff=lookback_cutoff,
-                )
-                if not added:
-                    print("    ⚠️  Duplicate BUY detected; skipping order/position")
-                    continue
-
-                await uow.position_repository.add(position)
-
-                orders_created.append(order)
-                positions_created.append(position)
-
-                cost = order.quantity * order.limit_price
-                print(f"    ✓ BUY: {order.quantity} shares @ ${order.limit_price} = ${cost:,.2f}")
-
-            elif action == "SELL":
-                order, position = await _execute_sell_order(
-                    strategy_id,
-                    provider_id,
-                    symbol,
-                    shares,
-                    current_price,
-                    rationale,
-                )
-
-                added = await add_order_if_new(
-                    uow.order_repository,
-                    order,
-                    lookback_cutoff=lookback_cutoff,
-                )
-                if not added:
-                    print("    ⚠️  Duplicate SELL detected; skipping order/position")
-                    continue
+                current_price = _recommendation_price(rec)
+                print(f"    Using recommendation price: ${current_price}", file=out)
+
+            # SELL share counts may be given as negative numbers
+            order_action = _ORDER_ACTIONS[action]
+            quantity = _to_decimal(abs(shares) if order_action == OrderAction.SELL else shares)
+
+            # Reject exact repeats by key before building any domain objects
+            key = build_order_idempotency_key(
+                strategy_id,
+                provider_id,
+                symbol,
+                order_action,
+                quantity,
+                current_price,
+            )
+            if key in seen_keys:
+                print(f"    ⚠️  Duplicate {action} detected; skipping order/position", file=out)
+                continue
 
-                await uow.position_repository.add(position)
+            order, position = _build_order_and_position(
+                order_action,
+                strategy_id,
+                provider_id,
+                symbol,
+                quantity,
+                current_price,
+                key,
+                now,
+                rationale,
+            )
+            if matches_existing_order(order, known_orders):
+                print(f"    ⚠️  Duplicate {action} detected; skipping order/position", file=out)
+                continue
 
-                orders_created.append(order)
-                positions_created.append(position)
+            seen_keys.add(key)
+            known_orders.append(order)
+            orders_created.append(order)
+            positions_created.append(position)
 
-                proceeds = order.quantity * order.limit_price
-                print(f"    ✓ SELL: {order.quantity} shares @ ${order.limit_price} = ${proceeds:,.2f}")
+            # BUYs spend cash on a long position; SELLs add their proceeds to cash
+            value = order.quantity * order.limit_price
+            if order_action == OrderAction.BUY:
+                total_cost += value
+                total_equity += value
+            else:
+                total_proceeds += value
+            print(
+                f"    ✓ {action}: {order.quantity} shares @ ${order.limit_price} = ${value:,.2f}",
+                file=out,
+            )
 
-            elif action == "HOLD":
-                print("    ⏸️  HOLD - no action taken")
+        await uow.order_repository.add_many(orders_created)
+        await uow.position_repository.add_many(positions_created)
 
         # Update portfolio account
-        total_cost = sum(
-            order.quantity * order.limit_price
-            for order in orders_created
-            if order.action == OrderAction.BUY
-        )
-        total_proceeds = sum(
-            order.quantity * order.limit_price
-            for order in orders_created
-            if order.action == OrderAction.SELL
-        )
-        total_equity = sum(
-            position.quantity * position.average_price
-            for position in positions_created
-            if position.side == PositionSide.LONG
-        )
-
         updated_account = account.model_copy(
             update={
                 "cash_balance": account.cash_balance - total_cost + total_proceeds,
                 "equity_value": account.equity_value + total_equity,
-                "updated_at": utc_now(),
+                "updated_at": now,
             }
         )
         await uow.portfolio_repository.upsert(updated_account)
@@ -309,12 +329,13 @@ async def _apply_strategy_recommendations(
         await uow.commit()
 
     # Summary
-    print("\n  Summary:")
-    print(f"    Orders: {len(orders_created)}")
-    print(f"    Positions: {len(positions_created)}")
-    print(f"    Cash: ${updated_account.cash_balance:,.2f}")
-    print(f"    Equity: ${updated_account.equity_value:,.2f}")
-    print(f"    Total: ${updated_account.cash_balance + updated_account.equity_value:,.2f}")
+    print("\n  Summary:", file=out)
+    print(f"    Orders: {len(orders_created)}", file=out)
+    print(f"    Positions: {len(positions_created)}", file=out)
+    print(f"    Cash: ${updated_account.cash_balance:,.2f}", file=out)
+    print(f"    Equity: ${updated_account.equity_value:,.2f}", file=out)
+    total_value = updated_account.cash_balance + updated_account.equity_value
+    print(f"    Total: ${total_value:,.2f}", file=out)
 
     return {
         "strategy_id": str(strategy_id),
@@ -334,9 +355,9 @@ async def _apply_all_recommendations(
     use_live_prices: bool,
 ) -> None:
     """Apply all recommendations from inline results file."""
-    # Load results
-    with open(results_file) as f:
-        results = json.load(f)
+    # Load results; the file is read in one call and decoded from bytes
+    data = results_file.read_bytes()
+    results = orjson.loads(data) if orjson is not None else json.loads(data)
 
     print(f"\n{'='*80}")
     print("APPLYING RECOMMENDATIONS TO PORTFOLIOS")
@@ -347,6 +368,18 @@ async def _apply_all_recommendations(
     print(f"Live prices: {use_live_prices}")
 
     initial_balance_decimal = Decimal(str(initial_balance))
+    uow_factory = get_container().unit_of_work_factory
+
+    # Fetch the live prices of every strategy's BUY/SELL symbols in one concurrent
+    # pass; strategies are then applied one at a time, as SQLite has a single writer
+    live_prices: dict[str, Decimal | BaseException] = {}
+    if use_live_prices and get_current_price is not None:
+        live_prices = await _fetch_live_prices(
+            symbol
+            for strategy_result in results
+            if strategy_result.get("status") == "success"
+            for symbol in _trade_symbols(strategy_result["recommendations"])
+        )
 
     # Process each strategy
     summaries = []
@@ -355,12 +388,21 @@ async def _apply_all_recommendations(
             print(f"\n⏭️  Skipping {strategy_result['strategy_name']} - status: {strategy_result.get('status')}")
             continue
 
+        # Buffer the strategy's progress lines and write them in one go,
+        # including when it fails part way through
+        out = io.StringIO()
         try:
-            summary = await _apply_strategy_recommendations(
-                strategy_result,
-                initial_balance_decimal,
-                use_live_prices,
-            )
+            try:
+                summary = await _apply_strategy_recommendations(
+                    uow_factory,
+                    out,
+                    strategy_result,
+                    initial_balance_decimal,
+                    live_prices,
+                )
+            finally:
+                sys.stdout.write(out.getvalue())
+                sys.stdout.flush()
             summaries.append(summary)
         except Exception as e:
             print(f"\n❌ Error applying {strategy_result['strategy_name']}: {e}")
@@ -3,19 +3,34 @@
 from __future__ import annotations
 
 import asyncio
+import importlib.util
 import json
 import os
+import sys
+from collections.abc import Coroutine, Iterable
 from datetime import UTC, datetime
+from enum import StrEnum
+from functools import lru_cache
 from pathlib import Path
+from typing import Annotated
 
 import httpx
 import typer
 from dotenv import load_dotenv
 from rich.console import Console
 from rich.table import Table
-from sqlalchemy import text
+from sqlalchemy import DateTime, bindparam, text
 
 from folios_v2.cli.deps import get_container
+from folios_v2.domain import LifecycleState
+from folios_v2.utils.json_cache import JsonDiskCache
+from folios_v2.utils.retry import RateLimiter, backoff_on
+
+# Optional libuv-based event loop; uvloop is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 # Load .env file
 _env_path = Path(__file__).parent.parent / ".env"
@@ -25,6 +40,20 @@ if _env_path.exists():
 app = typer.Typer(help="Check OpenAI batch request status")
 console = Console()
 
+# Largest page the OpenAI batch listing endpoint returns, and the cap on
+# concurrent single-batch lookups
+_BATCH_PAGE_SIZE = 100
+_BATCH_FETCH_CONCURRENCY = 10
+
+# Client-side cap on OpenAI API calls, so concurrent lookups do not trip 429s
+_OPENAI_LIMITER = RateLimiter(max_requests=20, burst_period=1.0)
+
+# Batches in these states never change again, so cached copies stay valid
+_TERMINAL_BATCH_STATUSES = frozenset({"completed", "failed", "expired", "cancelled"})
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
 
 def _format_timestamp(value: object) -> str:
     """Render timestamps consistently for table output."""
@@ -36,8 +65,41 @@ def _format_timestamp(value: object) -> str:
     return str(value)
 
 
-async def _list_openai_batches(limit: int = 100) -> list[dict]:
-    """List batch jobs from OpenAI API."""
+class OutputFormat(StrEnum):
+    """How the listing commands render their rows."""
+
+    RICH = "rich"
+    TSV = "tsv"
+    JSON = "json"
+
+
+def _write_plain(
+    output_format: OutputFormat,
+    header: tuple[str, ...],
+    rows: Iterable[tuple[object, ...]],
+) -> None:
+    """Write rows to stdout as TSV or a JSON array of records, bypassing Rich."""
+    write = sys.stdout.write
+    if output_format is OutputFormat.JSON:
+        records = [dict(zip(header, row, strict=True)) for row in rows]
+        write(json.dumps(records, indent=2, default=str) + "\n")
+        return
+    write("\t".join(header) + "\n")
+    for row in rows:
+        write("\t".join("" if value is None else str(value) for value in row) + "\n")
+
+
+@lru_cache(maxsize=4096)
+def _format_epoch(value: int | None) -> str:
+    """Render a Unix timestamp from the OpenAI API, or ``-`` when unset."""
+    if not value:
+        return "-"
+    # isoformat is cheaper than strftime; the slice drops the "+00:00" suffix
+    return datetime.fromtimestamp(value, tz=UTC).isoformat(sep=" ", timespec="seconds")[:19]
+
+
+def _openai_client() -> httpx.AsyncClient:
+    """Build an OpenAI API client; every request made through it shares its connections."""
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         console.print("[red]Error: OPENAI_API_KEY not found in environment[/red]")
@@ -48,73 +110,283 @@ async def _list_openai_batches(limit: int = 100) -> list[dict]:
 
     headers = {"Authorization": f"Bearer {api_key}"}
 
-    async with httpx.AsyncClient(base_url=endpoint, timeout=30.0, headers=headers) as client:
-        response = await client.get(f"/v1/batches?limit={limit}")
-        response.raise_for_status()
-        data = response.json()
-        return data.get("data", [])
-
-
-async def _get_local_batch_status() -> list[dict]:
-    """Get batch status from local database."""
+    return httpx.AsyncClient(
+        base_url=endpoint,
+        timeout=30.0,
+        headers=headers,
+        http2=_HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=20),
+    )
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry rate limiting, server errors and dropped connections, but not 4xx replies."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status_code = exc.response.status_code
+        return status_code == 429 or status_code >= 500
+    return True
+
+
+@backoff_on(httpx.HTTPStatusError, httpx.TransportError, retry_if=_is_retryable)
+async def _get_json(
+    client: httpx.AsyncClient,
+    url: str,
+    params: dict[str, str | int] | None = None,
+) -> dict:
+    """GET an OpenAI API path and return the decoded JSON body."""
+    await _OPENAI_LIMITER.acquire()
+    response = await client.get(url, params=params)
+    response.raise_for_status()
+    return response.json()
+
+
+# Field names for the plain (TSV/JSON) renderings of the local and remote tables
+_LOCAL_FIELDS = (
+    "task_id",
+    "strategy",
+    "lifecycle_state",
+    "provider_job_id",
+    "created_at",
+    "completed_at",
+    "last_poll_status",
+    "last_polled_at",
+)
+_REMOTE_FIELDS = (
+    "batch_id",
+    "status",
+    "created_at",
+    "completed_at",
+    "total",
+    "completed",
+    "failed",
+)
+
+
+def _batch_fields(batch: dict) -> tuple[object, ...]:
+    """Pick the ``remote`` table's fields from an OpenAI batch, unformatted."""
+    counts = batch.get("request_counts") or {}
+    return (
+        batch.get("id"),
+        batch.get("status"),
+        batch.get("created_at"),
+        batch.get("completed_at"),
+        counts.get("total"),
+        counts.get("completed"),
+        counts.get("failed"),
+    )
+
+
+def _batch_row(batch: dict) -> tuple[str, ...]:
+    """Render one OpenAI batch as the cells of a ``remote`` table row."""
+    counts = batch.get("request_counts", {})
+    return (
+        batch.get("id", "")[:40],
+        batch.get("status", "unknown"),
+        _format_epoch(batch.get("created_at")),
+        _format_epoch(batch.get("completed_at")),
+        str(counts.get("total", 0)),
+        str(counts.get("completed", 0)),
+        str(counts.get("failed", 0)),
+    )
+
+
+def _response_cache(enabled: bool, ttl: float) -> JsonDiskCache | None:
+    """Return the on-disk API response cache when ``--cache`` is given."""
+    return JsonDiskCache(ttl=ttl) if enabled else None
+
+
+async def _list_openai_batches(
+    client: httpx.AsyncClient,
+    limit: int | None = None,
+    cache: JsonDiskCache | None = None,
+) -> list[dict]:
+    """List batch jobs from OpenAI API, newest first.
+
+    Follows the ``after`` cursor across pages until ``limit`` batches have been
+    collected, or until the listing is exhausted when ``limit`` is None.
+    """
+    key = JsonDiskCache.key("openai_batches", str(client.base_url), limit)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    batches: list[dict] = []
+    params: dict[str, str | int] = {}
+    while True:
+        remaining = _BATCH_PAGE_SIZE if limit is None else limit - len(batches)
+        params["limit"] = min(_BATCH_PAGE_SIZE, remaining)
+        data = await _get_json(client, "/v1/batches", params)
+        page = data.get("data", [])
+        batches.extend(page)
+
+        if not page or not data.get("has_more"):
+            break
+        if limit is not None and len(batches) >= limit:
+            break
+        params["after"] = page[-1]["id"]
+
+    if cache is not None:
+        cache.set(key, batches)
+    return batches
+
+
+async def _get_openai_batches(
+    client: httpx.AsyncClient,
+    batch_ids: list[str],
+    cache: JsonDiskCache | None = None,
+) -> dict[str, dict]:
+    """Fetch individual batch jobs concurrently, keyed by ID.
+
+    Batches that cannot be fetched (unknown IDs, HTTP errors) are left out.
+    """
+    semaphore = asyncio.Semaphore(_BATCH_FETCH_CONCURRENCY)
+
+    async def _fetch(batch_id: str) -> dict:
+        key = JsonDiskCache.key("openai_batch", str(client.base_url), batch_id)
+        if cache is not None:
+            cached = cache.get(key)
+            if cached is not None:
+                return cached
+
+        async with semaphore:
+            batch = await _get_json(client, f"/v1/batches/{batch_id}")
+
+        if cache is not None:
+            terminal = batch.get("status") in _TERMINAL_BATCH_STATUSES
+            cache.set(key, batch, permanent=terminal)
+        return batch
+
+    batches = await asyncio.gather(
+        *(_fetch(batch_id) for batch_id in batch_ids), return_exceptions=True
+    )
+    return {
+        batch_id: batch
+        for batch_id, batch in zip(batch_ids, batches, strict=True)
+        if not isinstance(batch, BaseException)
+    }
+
+
+# Query execution tasks with batch mode, built once at import. A single
+# multi-path json_extract parses each payload once and returns the four fields
+# as a JSON array; ``since`` is bound as a DateTime so it renders in the stored
+# timestamp format.
+_LOCAL_BATCH_STATUS_STMT = text(
+    """
+        SELECT
+            et.id as task_id,
+            et.lifecycle_state,
+            json_extract(
+                et.payload,
+                '$.provider_job_id',
+                '$.metadata.artifact_dir',
+                '$.metadata.last_poll_status',
+                '$.metadata.last_polled_at'
+            ) as payload_fields,
+            et.created_at,
+            et.updated_at,
+            et.started_at,
+            et.completed_at,
+            r.id as request_id,
+            r.provider_id,
+            r.strategy_id,
+            s.name as strategy_name
+        FROM execution_tasks et
+        JOIN requests r ON et.request_id = r.id
+        LEFT JOIN strategies s ON r.strategy_id = s.id
+        WHERE r.mode = 'batch' AND r.provider_id = 'openai'
+            AND (:state IS NULL OR et.lifecycle_state = :state)
+            AND (:since IS NULL OR et.created_at >= :since)
+        ORDER BY et.created_at DESC
+        LIMIT :limit
+    """
+).bindparams(bindparam("since", type_=DateTime()))
+
+
+async def _get_local_batch_status(
+    *,
+    limit: int | None = None,
+    state: LifecycleState | None = None,
+    since: datetime | None = None,
+) -> list[dict]:
+    """Get batch status from local database.
+
+    Filtering, ordering and the row limit all happen in SQL, newest first.
+    """
     container = get_container()
 
     async with container.unit_of_work_factory() as uow:
-        # Query execution tasks with batch mode
-        query = """
-            SELECT
-                et.id as task_id,
-                et.lifecycle_state,
-                json_extract(et.payload, '$.provider_job_id') as provider_job_id,
-                json_extract(et.payload, '$.metadata.artifact_dir') as artifact_dir,
-                json_extract(et.payload, '$.metadata.last_poll_status') as last_poll_status,
-                json_extract(et.payload, '$.metadata.last_polled_at') as last_polled_at,
-                et.created_at,
-                et.updated_at,
-                et.started_at,
-                et.completed_at,
-                r.id as request_id,
-                r.provider_id,
-                r.strategy_id,
-                s.name as strategy_name
-            FROM execution_tasks et
-            JOIN requests r ON et.request_id = r.id
-            LEFT JOIN strategies s ON r.strategy_id = s.id
-            WHERE r.mode = 'batch' AND r.provider_id = 'openai'
-            ORDER BY et.created_at DESC
-        """
+        params = {
+            "state": state.value if state else None,
+            "since": since,
+            # SQLite reads a negative LIMIT as "no limit"
+            "limit": limit if limit is not None else -1,
+        }
 
         # Use the internal session from the UOW
-        cursor = await uow._session.execute(text(query))
-        rows = cursor.fetchall()
+        result = await uow._session.execute(_LOCAL_BATCH_STATUS_STMT, params)
 
         results = []
-        for row in rows:
-            results.append({
-                "task_id": row[0],
-                "lifecycle_state": row[1],
-                "provider_job_id": row[2],
-                "artifact_dir": row[3],
-                "last_poll_status": row[4],
-                "last_polled_at": row[5],
-                "created_at": row[6],
-                "updated_at": row[7],
-                "started_at": row[8],
-                "completed_at": row[9],
-                "request_id": row[10],
-                "provider_id": row[11],
-                "strategy_id": row[12],
-                "strategy_name": row[13],
-            })
+        for row in result.mappings():
+            task = dict(row)
+            (
+                task["provider_job_id"],
+                task["artifact_dir"],
+                task["last_poll_status"],
+                task["last_polled_at"],
+            ) = json.loads(task.pop("payload_fields"))
+            results.append(task)
 
         return results
 
 
+def _run_async(main: Coroutine[object, object, None]) -> None:
+    """Run a command's coroutine, on uvloop when it is installed."""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main)
+
+
 @app.command()
-def local() -> None:
+def local(
+    limit: Annotated[
+        int | None, typer.Option(min=1, help="Show only the newest N tasks")
+    ] = None,
+    state_filter: Annotated[
+        LifecycleState | None, typer.Option("--state", help="Only tasks in this lifecycle state")
+    ] = None,
+    since: Annotated[
+        datetime | None, typer.Option(help="Only tasks created at or after this time")
+    ] = None,
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="Render as a Rich table, TSV or JSON")
+    ] = OutputFormat.RICH,
+) -> None:
     """Show local batch request status from database."""
     async def _run() -> None:
-        tasks = await _get_local_batch_status()
+        tasks = await _get_local_batch_status(
+            limit=limit, state=state_filter, since=since
+        )
+
+        if output_format is not OutputFormat.RICH:
+            _write_plain(
+                output_format,
+                _LOCAL_FIELDS,
+                (
+                    (
+                        task["task_id"],
+                        task["strategy_name"] or task["strategy_id"],
+                        task["lifecycle_state"],
+                        task["provider_job_id"],
+                        task["created_at"],
+                        task["completed_at"],
+                        task["last_poll_status"],
+                        task["last_polled_at"],
+                    )
+                    for task in tasks
+                ),
+            )
+            return
 
         if not tasks:
             console.print("[yellow]No OpenAI batch tasks found in database[/yellow]")
@@ -130,20 +402,22 @@ def local() -> None:
         table.add_column("Last Poll Status", style="cyan")
         table.add_column("Last Polled At", style="blue")
 
-        for task in tasks:
-            provider_job_id = task["provider_job_id"] or "[dim]not submitted[/dim]"
-            poll_status = task["last_poll_status"] or "[dim]-[/dim]"
-
-            table.add_row(
+        rows = [
+            (
                 task["task_id"][:36],
                 task["strategy_name"] or task["strategy_id"][:36],
                 task["lifecycle_state"],
-                provider_job_id,
+                task["provider_job_id"] or "[dim]not submitted[/dim]",
                 _format_timestamp(task["created_at"]),
                 _format_timestamp(task["completed_at"]),
-                poll_status,
+                task["last_poll_status"] or "[dim]-[/dim]",
                 _format_timestamp(task["last_polled_at"]),
             )
+            for task in tasks
+        ]
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
 
         console.print(table)
         console.print(f"\n[green]Total tasks: {len(tasks)}[/green]")
@@ -155,15 +429,29 @@ def local() -> None:
         for state, count in state_counts.most_common():
             console.print(f"  {state}: {count}")
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
-def remote(limit: int = typer.Option(100, help="Maximum number of batches to retrieve")) -> None:
+def remote(
+    limit: int = typer.Option(100, help="Maximum number of batches to retrieve"),
+    cache: bool = typer.Option(False, "--cache/--no-cache", help="Reuse recent API responses"),
+    cache_ttl: float = typer.Option(60.0, help="Seconds a cached listing stays fresh"),
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="Render as a Rich table, TSV or JSON")
+    ] = OutputFormat.RICH,
+) -> None:
     """List batch jobs from OpenAI API."""
+    response_cache = _response_cache(cache, cache_ttl)
+
     async def _run() -> None:
         try:
-            batches = await _list_openai_batches(limit)
+            async with _openai_client() as client:
+                batches = await _list_openai_batches(client, limit, response_cache)
+
+            if output_format is not OutputFormat.RICH:
+                _write_plain(output_format, _REMOTE_FIELDS, map(_batch_fields, batches))
+                return
 
             if not batches:
                 console.print("[yellow]No batch jobs found in OpenAI account[/yellow]")
@@ -178,32 +466,10 @@ def remote(limit: int = typer.Option(100, help="Maximum number of batches to ret
             table.add_column("Completed", style="green")
             table.add_column("Failed", style="red")
 
-            for batch in batches:
-                counts = batch.get("request_counts", {})
-                created = batch.get("created_at", 0)
-                completed_at = batch.get("completed_at", 0)
-
-                # Convert timestamps to readable format
-                created_str = "-"
-                if created:
-                    created_str = datetime.fromtimestamp(created, tz=UTC).strftime(
-                        "%Y-%m-%d %H:%M:%S"
-                    )
-                completed_str = "-"
-                if completed_at:
-                    completed_str = datetime.fromtimestamp(
-                        completed_at, tz=UTC
-                    ).strftime("%Y-%m-%d %H:%M:%S")
-
-                table.add_row(
-                    batch.get("id", "")[:40],
-                    batch.get("status", "unknown"),
-                    created_str,
-                    completed_str,
-                    str(counts.get("total", 0)),
-                    str(counts.get("completed", 0)),
-                    str(counts.get("failed", 0)),
-                )
+            rows = [_batch_row(batch) for batch in batches]
+            add_row = table.add_row
+            for row in rows:
+                add_row(*row)
 
             console.print(table)
             console.print(f"\n[green]Total batches: {len(batches)}[/green]")
@@ -224,31 +490,68 @@ def remote(limit: int = typer.Option(100, help="Maximum number of batches to ret
             console.print(f"[red]Error: {exc}[/red]")
             raise typer.Exit(code=1) from exc
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
-def compare() -> None:
+def compare(
+    cache: bool = typer.Option(False, "--cache/--no-cache", help="Reuse recent API responses"),
+    cache_ttl: float = typer.Option(
+        60.0, help="Seconds a cached response stays fresh (finished batches never expire)"
+    ),
+) -> None:
     """Compare local database state with OpenAI API state."""
+    response_cache = _response_cache(cache, cache_ttl)
+
     async def _run() -> None:
-        console.print("[cyan]Fetching local tasks...[/cyan]")
-        local_tasks = await _get_local_batch_status()
+        # The listing's client stays open for the follow-up lookups below
+        client: httpx.AsyncClient | None = None
+
+        async def _fetch_remote_batches() -> list[dict]:
+            nonlocal client
+            try:
+                client = _openai_client()
+                return await _list_openai_batches(client, cache=response_cache)
+            except Exception as e:
+                console.print(f"[red]Error fetching remote batches: {e}[/red]")
+                return []
 
-        console.print("[cyan]Fetching remote batches...[/cyan]")
         try:
-            remote_batches = await _list_openai_batches()
-        except Exception as e:
-            console.print(f"[red]Error fetching remote batches: {e}[/red]")
-            remote_batches = []
+            # The database query and the API call are independent; run them together
+            console.print("[cyan]Fetching local tasks...[/cyan]")
+            console.print("[cyan]Fetching remote batches...[/cyan]")
+            local_tasks, remote_batches = await asyncio.gather(
+                _get_local_batch_status(),
+                _fetch_remote_batches(),
+            )
 
-        # Create lookup by provider_job_id
-        remote_by_id = {b["id"]: b for b in remote_batches}
+            # Create lookup by provider_job_id
+            remote_by_id = {b["id"]: b for b in remote_batches}
 
-        console.print("\n[bold]Comparison:[/bold]\n")
+            # Split tasks by whether they have a provider job ID in a single pass
+            submitted_tasks: list[dict] = []
+            pending_tasks: list[dict] = []
+            for task in local_tasks:
+                if task["provider_job_id"]:
+                    submitted_tasks.append(task)
+                else:
+                    pending_tasks.append(task)
+
+            # Distinct tracked job IDs in task order, reused for the orphan check below
+            submitted_ids = dict.fromkeys(t["provider_job_id"] for t in submitted_tasks)
 
-        # Tasks with provider job IDs
-        submitted_tasks = [t for t in local_tasks if t["provider_job_id"]]
-        pending_tasks = [t for t in local_tasks if not t["provider_job_id"]]
+            # Look up tracked batches the listing did not return, concurrently, before
+            # reporting them as missing
+            unlisted_ids = [job_id for job_id in submitted_ids if job_id not in remote_by_id]
+            if client is not None and remote_batches and unlisted_ids:
+                remote_by_id.update(
+                    await _get_openai_batches(client, unlisted_ids, response_cache)
+                )
+        finally:
+            if client is not None:
+                await client.aclose()
+
+        console.print("\n[bold]Comparison:[/bold]\n")
 
         if submitted_tasks:
             console.print(f"[green]Tasks submitted to OpenAI: {len(submitted_tasks)}[/green]")
@@ -281,8 +584,7 @@ def compare() -> None:
                 console.print(f"  ... and {pending_count - 10} more")
 
         # Remote batches not in local DB
-        local_job_ids = {t["provider_job_id"] for t in submitted_tasks}
-        orphaned_batches = [b for b in remote_batches if b["id"] not in local_job_ids]
+        orphaned_batches = [b for b in remote_batches if b["id"] not in submitted_ids]
 
         if orphaned_batches:
             orphan_count = len(orphaned_batches)
@@ -295,7 +597,7 @@ def compare() -> None:
             if orphan_count > 10:
                 console.print(f"  ... and {orphan_count - 10} more")
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -304,25 +606,11 @@ def details(
 ) -> None:
     """Get detailed information about a specific batch job."""
     async def _run() -> None:
-        api_key = os.getenv("OPENAI_API_KEY")
-        if not api_key:
-            console.print("[red]Error: OPENAI_API_KEY not found in environment[/red]")
-            raise typer.Exit(code=1)
-
-        endpoint = os.getenv("OPENAI_API_BASE", "https://api.openai.com")
-        endpoint = endpoint.rstrip("/")
-
-        headers = {"Authorization": f"Bearer {api_key}"}
+        client = _openai_client()
 
         try:
-            async with httpx.AsyncClient(
-                base_url=endpoint,
-                timeout=30.0,
-                headers=headers,
-            ) as client:
-                response = await client.get(f"/v1/batches/{batch_id}")
-                response.raise_for_status()
-                batch = response.json()
+            async with client:
+                batch = await _get_json(client, f"/v1/batches/{batch_id}")
 
             console.print(json.dumps(batch, indent=2))
 
@@ -335,7 +623,7 @@ def details(
             console.print(f"[red]Error: {exc}[/red]")
             raise typer.Exit(code=1) from exc
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 if __name__ == "__main__":
@@ -5,21 +5,74 @@ from __future__ import annotations
 import asyncio
 import json
 import os
+import sys
+from collections.abc import Coroutine, Iterable
 from datetime import UTC, datetime
+from enum import StrEnum
 from pathlib import Path
+from typing import Annotated
 
 import typer
 from dotenv import load_dotenv
 from google import genai
+from google.genai import errors, types
 from rich.console import Console
 from rich.table import Table
-from sqlalchemy import text
+from sqlalchemy import DateTime, bindparam, text
 
 from folios_v2.cli.deps import get_container
+from folios_v2.domain import LifecycleState
+from folios_v2.utils.json_cache import JsonDiskCache
+from folios_v2.utils.retry import RateLimiter, backoff_on
+
+# Optional libuv-based event loop; uvloop is not available on Windows
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 app = typer.Typer(help="Check Gemini batch request status")
 console = Console()
 
+# One client per process so concurrent polls share its connection pool
+_CLIENT: genai.Client | None = None
+
+# Field names for the plain (TSV/JSON) rendering of the local table
+_LOCAL_FIELDS = (
+    "task_id",
+    "strategy",
+    "lifecycle_state",
+    "provider_job_id",
+    "created_at",
+    "started_at",
+    "last_poll_status",
+    "last_polled_at",
+)
+
+# Job lookups currently in flight, so concurrent requests for one job share a call
+_INFLIGHT: dict[str, asyncio.Future[types.BatchJob]] = {}
+
+# Client-side cap on Gemini API calls, so concurrent polls do not trip 429s,
+# and on how many job lookups status keeps in flight at once
+_GEMINI_LIMITER = RateLimiter(max_requests=20, burst_period=1.0)
+_JOB_POLL_CONCURRENCY = 16
+
+# Local task states after which the remote job has nothing left to report
+_FINISHED_TASK_STATES = frozenset({
+    LifecycleState.SUCCEEDED,
+    LifecycleState.FAILED,
+    LifecycleState.CANCELLED,
+    LifecycleState.TIMED_OUT,
+})
+
+# Jobs in these states never change again, so cached copies stay valid
+_TERMINAL_JOB_STATES = frozenset({
+    types.JobState.JOB_STATE_SUCCEEDED,
+    types.JobState.JOB_STATE_FAILED,
+    types.JobState.JOB_STATE_CANCELLED,
+    types.JobState.JOB_STATE_EXPIRED,
+})
+
 
 def _format_timestamp(value: object) -> str:
     if not value:
@@ -29,103 +82,239 @@ def _format_timestamp(value: object) -> str:
     return str(value)
 
 
+class OutputFormat(StrEnum):
+    """How the listing commands render their rows."""
+
+    RICH = "rich"
+    TSV = "tsv"
+    JSON = "json"
+
+
+def _write_plain(
+    output_format: OutputFormat,
+    header: tuple[str, ...],
+    rows: Iterable[tuple[object, ...]],
+) -> None:
+    """Write rows to stdout as TSV or a JSON array of records, bypassing Rich."""
+    write = sys.stdout.write
+    if output_format is OutputFormat.JSON:
+        records = [dict(zip(header, row, strict=True)) for row in rows]
+        write(json.dumps(records, indent=2, default=str) + "\n")
+        return
+    write("\t".join(header) + "\n")
+    for row in rows:
+        write("\t".join("" if value is None else str(value) for value in row) + "\n")
+
+
 _env_path = Path(__file__).parent.parent / ".env"
 if _env_path.exists():
     load_dotenv(_env_path)
 
 
-async def _get_local_batch_status() -> list[dict]:
-    """Get Gemini batch status from local database."""
+# Query execution tasks with batch mode, built once at import. A single
+# multi-path json_extract parses each payload once and returns the five fields
+# as a JSON array; ``since`` is bound as a DateTime so it renders in the stored
+# timestamp format.
+_LOCAL_BATCH_STATUS_STMT = text(
+    """
+        SELECT
+            et.id as task_id,
+            et.lifecycle_state,
+            json_extract(
+                et.payload,
+                '$.provider_job_id',
+                '$.metadata.artifact_dir',
+                '$.metadata.last_poll_status',
+                '$.metadata.last_polled_at',
+                '$.metadata.last_poll_metadata.counts'
+            ) as payload_fields,
+            et.created_at,
+            et.updated_at,
+            et.started_at,
+            et.completed_at,
+            r.id as request_id,
+            r.provider_id,
+            r.strategy_id,
+            s.name as strategy_name
+        FROM execution_tasks et
+        JOIN requests r ON et.request_id = r.id
+        LEFT JOIN strategies s ON r.strategy_id = s.id
+        WHERE r.mode = 'batch' AND r.provider_id = 'gemini'
+            AND (
+                :only_submitted = 0
+                OR COALESCE(json_extract(et.payload, '$.provider_job_id'), '') <> ''
+            )
+            AND (:state IS NULL OR et.lifecycle_state = :state)
+            AND (:since IS NULL OR et.created_at >= :since)
+        ORDER BY et.created_at DESC
+        LIMIT :limit
+    """
+).bindparams(bindparam("since", type_=DateTime()))
+
+
+async def _get_local_batch_status(
+    *,
+    limit: int | None = None,
+    state: LifecycleState | None = None,
+    since: datetime | None = None,
+    only_submitted: bool = False,
+) -> list[dict]:
+    """Get Gemini batch status from local database.
+
+    Filtering, ordering and the row limit all happen in SQL, newest first.
+    """
     container = get_container()
 
     async with container.unit_of_work_factory() as uow:
-        # Query execution tasks with batch mode
-        query = """
-            SELECT
-                et.id as task_id,
-                et.lifecycle_state,
-                json_extract(et.payload, '$.provider_job_id') as provider_job_id,
-                json_extract(et.payload, '$.metadata.artifact_dir') as artifact_dir,
-                json_extract(et.payload, '$.metadata.last_poll_status') as last_poll_status,
-                json_extract(et.payload, '$.metadata.last_polled_at') as last_polled_at,
-                et.created_at,
-                et.updated_at,
-                et.started_at,
-                et.completed_at,
-                r.id as request_id,
-                r.provider_id,
-                r.strategy_id,
-                s.name as strategy_name
-            FROM execution_tasks et
-            JOIN requests r ON et.request_id = r.id
-            LEFT JOIN strategies s ON r.strategy_id = s.id
-            WHERE r.mode = 'batch' AND r.provider_id = 'gemini'
-            ORDER BY et.created_at DESC
-        """
-
-        cursor = await uow._session.execute(text(query))
-        rows = cursor.fetchall()
+        params = {
+            "state": state.value if state else None,
+            "since": since,
+            "only_submitted": only_submitted,
+            # SQLite reads a negative LIMIT as "no limit"
+            "limit": limit if limit is not None else -1,
+        }
+
+        result = await uow._session.execute(_LOCAL_BATCH_STATUS_STMT, params)
 
         results = []
-        for row in rows:
-            results.append({
-                "task_id": row[0],
-                "lifecycle_state": row[1],
-                "provider_job_id": row[2],
-                "artifact_dir": row[3],
-                "last_poll_status": row[4],
-                "last_polled_at": row[5],
-                "created_at": row[6],
-                "updated_at": row[7],
-                "started_at": row[8],
-                "completed_at": row[9],
-                "request_id": row[10],
-                "provider_id": row[11],
-                "strategy_id": row[12],
-                "strategy_name": row[13],
-            })
+        for row in result.mappings():
+            task = dict(row)
+            (
+                task["provider_job_id"],
+                task["artifact_dir"],
+                task["last_poll_status"],
+                task["last_polled_at"],
+                task["last_poll_counts"],
+            ) = json.loads(task.pop("payload_fields"))
+            results.append(task)
 
         return results
 
 
 def _get_gemini_client() -> genai.Client:
-    """Create a Gemini API client."""
-    api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        console.print("[red]Error: GEMINI_API_KEY or GOOGLE_API_KEY not found in environment[/red]")
-        raise typer.Exit(code=1)
+    """Return the shared Gemini API client, creating it on first use."""
+    global _CLIENT
+    if _CLIENT is None:
+        api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            console.print(
+                "[red]Error: GEMINI_API_KEY or GOOGLE_API_KEY not found in environment[/red]"
+            )
+            raise typer.Exit(code=1)
+
+        # Use long timeout for batch operations (10 minutes in milliseconds)
+        _CLIENT = genai.Client(api_key=api_key, http_options={"timeout": 600000})
+    return _CLIENT
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """Retry rate limiting and server errors, but not other client errors."""
+    return isinstance(exc, errors.ServerError) or getattr(exc, "code", None) == 429
+
+
+@backoff_on(errors.APIError, retry_if=_is_retryable)
+async def _request_job(job_id: str) -> types.BatchJob:
+    """Fetch a batch job from the Gemini API."""
+    client = _get_gemini_client()
+    await _GEMINI_LIMITER.acquire()
+    return await client.aio.batches.get(name=job_id)
+
+
+async def _fetch_job(job_id: str) -> types.BatchJob:
+    """Fetch a batch job, joining a lookup for the same job that is already in flight."""
+    task = _INFLIGHT.get(job_id)
+    if task is None:
+        task = asyncio.ensure_future(_request_job(job_id))
+        _INFLIGHT[job_id] = task
+        task.add_done_callback(lambda _: _INFLIGHT.pop(job_id, None))
+    # Shield the shared lookup so one caller's cancellation does not fail the others
+    return await asyncio.shield(task)
+
+
+async def _load_job(job_id: str, cache: JsonDiskCache | None) -> types.BatchJob:
+    """Fetch a batch job, answering from ``cache`` while its copy is fresh."""
+    if cache is None:
+        return await _fetch_job(job_id)
 
-    # Use long timeout for batch operations (10 minutes in milliseconds)
-    return genai.Client(api_key=api_key, http_options={"timeout": 600000})
+    key = JsonDiskCache.key("gemini_batch_job", job_id)
+    cached = cache.get(key)
+    if cached is not None:
+        return types.BatchJob.model_validate(cached)
 
+    job = await _fetch_job(job_id)
+    cache.set(
+        key,
+        job.model_dump(mode="json", exclude_none=True),
+        permanent=job.state in _TERMINAL_JOB_STATES,
+    )
+    return job
 
-async def _get_batch_job(job_id: str) -> dict:
+
+async def _get_batch_job(job_id: str, cache: JsonDiskCache | None = None) -> dict:
     """Get batch job details from Gemini API."""
-    def _fetch() -> dict:
-        client = _get_gemini_client()
-        job = client.batches.get(name=job_id)
-
-        # Convert job object to dict
-        state = getattr(getattr(job, "state", None), "name", "UNKNOWN")
-        counts = getattr(job, "batch_stats", None)
-
-        return {
-            "name": getattr(job, "name", job_id),
-            "state": state,
-            "total_requests": getattr(counts, "total_requests", 0) if counts else 0,
-            "completed_requests": getattr(counts, "completed_requests", 0) if counts else 0,
-            "failed_requests": getattr(counts, "failed_requests", 0) if counts else 0,
-            "create_time": getattr(job, "create_time", None),
-        }
+    job = await _load_job(job_id, cache)
+
+    # Convert job object to dict
+    state = getattr(getattr(job, "state", None), "name", "UNKNOWN")
+    counts = getattr(job, "batch_stats", None)
 
-    return await asyncio.to_thread(_fetch)
+    return {
+        "name": getattr(job, "name", job_id),
+        "state": state,
+        "total_requests": getattr(counts, "total_requests", 0) if counts else 0,
+        "completed_requests": getattr(counts, "completed_requests", 0) if counts else 0,
+        "failed_requests": getattr(counts, "failed_requests", 0) if counts else 0,
+        "create_time": getattr(job, "create_time", None),
+    }
+
+
+def _run_async(main: Coroutine[object, object, None]) -> None:
+    """Run a command's coroutine, on uvloop when it is installed."""
+    loop_factory = uvloop.new_event_loop if uvloop is not None else None
+    with asyncio.Runner(loop_factory=loop_factory) as runner:
+        runner.run(main)
 
 
 @app.command()
-def local() -> None:
+def local(
+    limit: Annotated[
+        int | None, typer.Option(min=1, help="Show only the newest N tasks")
+    ] = None,
+    state_filter: Annotated[
+        LifecycleState | None, typer.Option("--state", help="Only tasks in this lifecycle state")
+    ] = None,
+    since: Annotated[
+        datetime | None, typer.Option(help="Only tasks created at or after this time")
+    ] = None,
+    output_format: Annotated[
+        OutputFormat, typer.Option("--format", help="Render as a Rich table, TSV or JSON")
+    ] = OutputFormat.RICH,
+) -> None:
     """Show local Gemini batch request status from database."""
     async def _run() -> None:
-        tasks = await _get_local_batch_status()
+        tasks = await _get_local_batch_status(
+            limit=limit, state=state_filter, since=since
+        )
+
+        if output_format is not OutputFormat.RICH:
+            _write_plain(
+                output_format,
+                _LOCAL_FIELDS,
+                (
+                    (
+                        task["task_id"],
+                        task["strategy_name"] or task["strategy_id"],
+                        task["lifecycle_state"],
+                        task["provider_job_id"],
+                        task["created_at"],
+                        task["started_at"],
+                        task["last_poll_status"],
+                        task["last_polled_at"],
+                    )
+                    for task in tasks
+                ),
+            )
+            return
 
         if not tasks:
             console.print("[yellow]No Gemini batch tasks found in database[/yellow]")
@@ -141,25 +330,22 @@ def local() -> None:
         table.add_column("Last Poll Status", style="cyan")
         table.add_column("Last Polled At", style="blue")
 
-        for task in tasks:
-            provider_job_id = task["provider_job_id"] or "[dim]not submitted[/dim]"
-            poll_status = task["last_poll_status"] or "[dim]-[/dim]"
-            provider_display = (
-                provider_job_id[:50]
-                if provider_job_id != "[dim]not submitted[/dim]"
-                else provider_job_id
-            )
-
-            table.add_row(
+        rows = [
+            (
                 task["task_id"][:36],
                 task["strategy_name"] or task["strategy_id"][:36],
                 task["lifecycle_state"],
-                provider_display,
+                (task["provider_job_id"] or "")[:50] or "[dim]not submitted[/dim]",
                 _format_timestamp(task["created_at"]),
                 _format_timestamp(task["started_at"]),
-                poll_status,
+                task["last_poll_status"] or "[dim]-[/dim]",
                 _format_timestamp(task["last_polled_at"]),
             )
+            for task in tasks
+        ]
+        add_row = table.add_row
+        for row in rows:
+            add_row(*row)
 
         console.print(table)
         console.print(f"\n[green]Total tasks: {len(tasks)}[/green]")
@@ -171,20 +357,29 @@ def local() -> None:
         for state, count in state_counts.most_common():
             console.print(f"  {state}: {count}")
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
 def status(
     job_id_arg: str = typer.Argument(None, help="Specific Gemini batch job ID to check"),
+    cache: bool = typer.Option(False, "--cache/--no-cache", help="Reuse recent API responses"),
+    cache_ttl: float = typer.Option(
+        60.0, help="Seconds a cached response stays fresh (finished jobs never expire)"
+    ),
+    poll_finished: bool = typer.Option(
+        False, "--poll-finished", help="Also poll jobs whose local task already finished"
+    ),
 ) -> None:
     """Check status of Gemini batch jobs (all or specific job)."""
+    response_cache = JsonDiskCache(ttl=cache_ttl) if cache else None
+
     async def _run() -> None:
         if job_id_arg:
             # Check specific job
             try:
                 console.print(f"[cyan]Fetching status for job: {job_id_arg}[/cyan]\n")
-                job_info = await _get_batch_job(job_id_arg)
+                job_info = await _get_batch_job(job_id_arg, response_cache)
 
                 console.print(f"[bold]Job ID:[/bold] {job_info['name']}")
                 console.print(f"[bold]State:[/bold] {job_info['state']}")
@@ -205,8 +400,7 @@ def status(
                 raise typer.Exit(code=1) from exc
         else:
             # Check all jobs from local DB
-            tasks = await _get_local_batch_status()
-            submitted_tasks = [t for t in tasks if t["provider_job_id"]]
+            submitted_tasks = await _get_local_batch_status(only_submitted=True)
 
             if not submitted_tasks:
                 console.print("[yellow]No submitted Gemini batch jobs found[/yellow]")
@@ -225,40 +419,72 @@ def status(
             table.add_column("Done", style="green")
             table.add_column("Failed", style="red")
 
+            # Tasks that already finished locally show their last recorded poll instead
+            active_tasks = [
+                t
+                for t in submitted_tasks
+                if poll_finished or t["lifecycle_state"] not in _FINISHED_TASK_STATES
+            ]
+
+            # Poll the remaining jobs concurrently, a bounded number at a time; a failed
+            # lookup comes back in place of its result
+            semaphore = asyncio.Semaphore(_JOB_POLL_CONCURRENCY)
+
+            async def _poll(job_id: str) -> dict:
+                async with semaphore:
+                    return await _get_batch_job(job_id, response_cache)
+
+            job_infos = await asyncio.gather(
+                *(_poll(task["provider_job_id"]) for task in active_tasks),
+                return_exceptions=True,
+            )
+            job_info_by_task = dict(
+                zip((t["task_id"] for t in active_tasks), job_infos, strict=True)
+            )
+
             for task in submitted_tasks:
                 job_id = task["provider_job_id"]
                 local_state = task["lifecycle_state"]
 
-                try:
-                    job_info = await _get_batch_job(job_id)
-                    remote_state = job_info["state"]
-                    total = job_info["total_requests"]
-                    completed = job_info["completed_requests"]
-                    failed = job_info["failed_requests"]
-
+                if task["task_id"] not in job_info_by_task:
+                    counts = task["last_poll_counts"] or {}
                     table.add_row(
                         task["task_id"][:24],
                         job_id[:40] if len(job_id) > 40 else job_id,
                         local_state,
-                        remote_state,
-                        str(total),
-                        str(completed),
-                        str(failed),
+                        f"[dim]{task['last_poll_status'] or '-'} (not polled)[/dim]",
+                        str(counts.get("total", "-")),
+                        str(counts.get("completed", "-")),
+                        str(counts.get("failed", "-")),
                     )
-                except Exception as e:
+                    continue
+
+                job_info = job_info_by_task[task["task_id"]]
+                if isinstance(job_info, BaseException):
                     table.add_row(
                         task["task_id"][:24],
                         job_id[:40] if len(job_id) > 40 else job_id,
                         local_state,
-                        f"[red]ERROR: {str(e)[:20]}[/red]",
+                        f"[red]ERROR: {str(job_info)[:20]}[/red]",
                         "-",
                         "-",
                         "-",
                     )
+                    continue
+
+                table.add_row(
+                    task["task_id"][:24],
+                    job_id[:40] if len(job_id) > 40 else job_id,
+                    local_state,
+                    job_info["state"],
+                    str(job_info["total_requests"]),
+                    str(job_info["completed_requests"]),
+                    str(job_info["failed_requests"]),
+                )
 
             console.print(table)
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 @app.command()
@@ -268,36 +494,17 @@ def details(
     """Get detailed information about a specific batch job."""
     async def _run() -> None:
         try:
-            def _fetch() -> dict:
-                client = _get_gemini_client()
-                job = client.batches.get(name=job_id)
-
-                # Try to serialize the job object
-                job_dict = {}
-                for attr in dir(job):
-                    if attr.startswith("_"):
-                        continue
-                    try:
-                        value = getattr(job, attr)
-                    except AttributeError:
-                        continue
-                    if callable(value):
-                        continue
-                    if hasattr(value, "__dict__"):
-                        job_dict[attr] = str(value)
-                    else:
-                        job_dict[attr] = value
-
-                return job_dict
-
-            job_dict = await asyncio.to_thread(_fetch)
-            console.print(json.dumps(job_dict, indent=2, default=str))
+            job = await _fetch_job(job_id)
+
+            # BatchJob is a pydantic model; dump its fields as JSON-ready values
+            job_dict = job.model_dump(mode="json")
+            console.print(json.dumps(job_dict, indent=2))
 
         except Exception as exc:
             console.print(f"[red]Error: {exc}[/red]")
             raise typer.Exit(code=1) from exc
 
-    asyncio.run(_run())
+    _run_async(_run())
 
 
 if __name__ == "__main__":
@@ -136,6 +136,8 @@ class PositionRepository(Protocol):
 
     async def add(self, position: Position) -> None: ...
 
+    async def add_many(self, positions: Sequence[Position]) -> None: ...
+
     async def update(self, position: Position) -> None: ...
 
     async def list_open(
@@ -152,6 +154,8 @@ class OrderRepository(Protocol):
 
     async def add(self, order: Order) -> None: ...
 
+    async def add_many(self, orders: Sequence[Order]) -> None: ...
+
     async def update(self, order: Order) -> None: ...
 
     async def list_recent(
@@ -235,6 +235,10 @@ class InMemoryPositionRepository(PositionRepository):
     async def add(self, position: Position) -> None:
         self._positions[position.id] = position
 
+    async def add_many(self, positions: Sequence[Position]) -> None:
+        for position in positions:
+            self._positions[position.id] = position
+
     async def update(self, position: Position) -> None:
         if position.id not in self._positions:
             msg = f"Position {position.id} not found"
@@ -267,6 +271,10 @@ class InMemoryOrderRepository(OrderRepository):
     async def add(self, order: Order) -> None:
         self._orders[order.id] = order
 
+    async def add_many(self, orders: Sequence[Order]) -> None:
+        for order in orders:
+            self._orders[order.id] = order
+
     async def update(self, order: Order) -> None:
         if order.id not in self._orders:
             msg = f"Order {order.id} not found"
@@ -26,8 +26,23 @@ async def _initial_migration(engine: AsyncEngine) -> None:
             await conn.execute(text("INSERT INTO folios_schema_migrations (version) VALUES (1)"))
 
 
+async def _execution_task_index_migration(engine: AsyncEngine) -> None:
+    # Backs the request join and newest-first ordering of batch status queries
+    async with engine.begin() as conn:
+        await conn.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_execution_tasks_request_created "
+                "ON execution_tasks (request_id, created_at DESC)"
+            )
+        )
+        await conn.execute(
+            text("INSERT OR IGNORE INTO folios_schema_migrations (version) VALUES (2)")
+        )
+
+
 async def apply_migrations(engine: AsyncEngine) -> None:
     await _initial_migration(engine)
+    await _execution_task_index_migration(engine)
 
 
 __all__ = ["apply_migrations"]
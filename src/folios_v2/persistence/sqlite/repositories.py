@@ -414,8 +414,9 @@ class SQLitePositionRepository(PositionRepository):
             return None
         return Position.model_validate(record.payload)
 
-    async def add(self, position: Position) -> None:
-        record = PositionRecord(
+    @staticmethod
+    def _to_record(position: Position) -> PositionRecord:
+        return PositionRecord(
             id=str(position.id),
             strategy_id=str(position.strategy_id),
             provider_id=position.provider_id.value if position.provider_id else None,
@@ -425,7 +426,12 @@ class SQLitePositionRepository(PositionRepository):
             closed_at=position.closed_at,
             payload=position.model_dump(mode="json"),
         )
-        self._session.add(record)
+
+    async def add(self, position: Position) -> None:
+        self._session.add(self._to_record(position))
+
+    async def add_many(self, positions: Sequence[Position]) -> None:
+        self._session.add_all([self._to_record(position) for position in positions])
 
     async def update(self, position: Position) -> None:
         record = await self._session.get(PositionRecord, str(position.id))
@@ -463,8 +469,9 @@ class SQLiteOrderRepository(OrderRepository):
             return None
         return Order.model_validate(record.payload)
 
-    async def add(self, order: Order) -> None:
-        record = OrderRecord(
+    @staticmethod
+    def _to_record(order: Order) -> OrderRecord:
+        return OrderRecord(
             id=str(order.id),
             strategy_id=str(order.strategy_id),
             provider_id=order.provider_id.value if order.provider_id else None,
@@ -473,7 +480,12 @@ class SQLiteOrderRepository(OrderRepository):
             placed_at=order.placed_at,
             payload=order.model_dump(mode="json"),
         )
-        self._session.add(record)
+
+    async def add(self, order: Order) -> None:
+        self._session.add(self._to_record(order))
+
+    async def add_many(self, orders: Sequence[Order]) -> None:
+        self._session.add_all([self._to_record(order) for order in orders])
 
     async def update(self, order: Order) -> None:
         record = await self._session.get(OrderRecord, str(order.id))
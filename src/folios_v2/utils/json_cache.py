@@ -0,0 +1,60 @@
+"""File-backed cache of JSON values for repeated provider API lookups."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from hashlib import blake2b
+from pathlib import Path
+from typing import Any, TypeAlias
+
+JsonDocument: TypeAlias = dict[str, Any] | list[Any]
+
+DEFAULT_CACHE_DIR = Path.home() / ".folios" / "batch_cache"
+
+
+class JsonDiskCache:
+    """Store JSON objects and arrays as one file per key.
+
+    Entries older than ``ttl`` seconds are treated as missing, except those
+    stored with ``permanent=True`` (for example jobs already in a terminal
+    state), which stay valid until the file is removed.
+    """
+
+    def __init__(self, directory: Path = DEFAULT_CACHE_DIR, *, ttl: float = 60.0) -> None:
+        self._directory = directory
+        self._ttl = ttl
+
+    @staticmethod
+    def key(*parts: object) -> str:
+        """Derive a stable cache key from the parts identifying a lookup."""
+        payload = json.dumps(parts, sort_keys=True, default=str)
+        return blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self._directory / f"{key}.json"
+
+    def get(self, key: str) -> JsonDocument | None:
+        """Return the cached value for ``key``, or None when absent or stale."""
+        try:
+            entry = json.loads(self._path(key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if not entry.get("permanent") and time.time() - entry.get("stored_at", 0) > self._ttl:
+            return None
+        value: JsonDocument | None = entry.get("value")
+        return value
+
+    def set(self, key: str, value: JsonDocument, *, permanent: bool = False) -> None:
+        """Store ``value`` under ``key``, replacing any previous entry."""
+        self._directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        entry = {"stored_at": time.time(), "permanent": permanent, "value": value}
+        # Write to a sibling file first so readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(entry), encoding="utf-8")
+        tmp_path.replace(path)
+
+
+__all__ = ["DEFAULT_CACHE_DIR", "JsonDiskCache", "JsonDocument"]
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
@@ -90,26 +91,22 @@ def build_order_idempotency_key(
     return fingerprint.key()
 
 
-async def is_duplicate_order(
-    repository: SupportsOrderLookup,
+def matches_existing_order(
     order: Order,
+    existing_orders: Iterable[Order],
     *,
-    recent_limit: int = 250,
     quantity_tolerance: Decimal = Decimal("0.001"),
     price_tolerance: Decimal = Decimal("0.01"),
     lookback_cutoff: datetime | None = None,
 ) -> bool:
-    """Return True when an equivalent order already exists."""
+    """Return True when ``order`` is equivalent to one of ``existing_orders``.
+
+    Lets callers fetch recent orders once and check many candidates against them.
+    """
     fingerprint = build_order_fingerprint(order)
     target_key = fingerprint.key()
 
-    recent_orders = await repository.list_recent(
-        order.strategy_id,
-        limit=recent_limit,
-        provider_id=order.provider_id,
-    )
-
-    for existing in recent_orders:
+    for existing in existing_orders:
         if lookback_cutoff and existing.placed_at and existing.placed_at < lookback_cutoff:
             # Skip orders older than the lookback threshold, if provided.
             continue
@@ -146,6 +143,30 @@ async def is_duplicate_order(
     return False
 
 
+async def is_duplicate_order(
+    repository: SupportsOrderLookup,
+    order: Order,
+    *,
+    recent_limit: int = 250,
+    quantity_tolerance: Decimal = Decimal("0.001"),
+    price_tolerance: Decimal = Decimal("0.01"),
+    lookback_cutoff: datetime | None = None,
+) -> bool:
+    """Return True when an equivalent order already exists."""
+    recent_orders = await repository.list_recent(
+        order.strategy_id,
+        limit=recent_limit,
+        provider_id=order.provider_id,
+    )
+    return matches_existing_order(
+        order,
+        recent_orders,
+        quantity_tolerance=quantity_tolerance,
+        price_tolerance=price_tolerance,
+        lookback_cutoff=lookback_cutoff,
+    )
+
+
 async def add_order_if_new(
     repository: SupportsOrderLookup,
     order: Order,
@@ -192,4 +213,5 @@ __all__ = [
     "build_order_fingerprint",
     "build_order_idempotency_key",
     "is_duplicate_order",
+    "matches_existing_order",
 ]
@@ -0,0 +1,83 @@
+"""Backoff and rate-limiting helpers for calls to remote provider APIs."""
+
+from __future__ import annotations
+
+import asyncio
+import functools
+import random
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from typing import ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class RateLimiter:
+    """Allow at most ``max_requests`` acquisitions in any ``burst_period`` seconds.
+
+    Keeps the timestamps of recent acquisitions; once the window is full, the
+    next caller sleeps until the oldest one falls out of it.
+    """
+
+    def __init__(self, max_requests: int, burst_period: float = 1.0) -> None:
+        if max_requests < 1:
+            raise ValueError("max_requests must be at least 1")
+        self._max_requests = max_requests
+        self._burst_period = burst_period
+        self._calls: deque[float] = deque()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            now = time.monotonic()
+            self._evict(now)
+            while len(self._calls) >= self._max_requests:
+                await asyncio.sleep(self._calls[0] + self._burst_period - now)
+                now = time.monotonic()
+                self._evict(now)
+            self._calls.append(now)
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self._burst_period
+        while self._calls and self._calls[0] <= cutoff:
+            self._calls.popleft()
+
+
+def backoff_on(
+    *exceptions: type[BaseException],
+    max_tries: int = 6,
+    base: float = 0.5,
+    factor: float = 2.0,
+    jitter: float = 0.1,
+    retry_if: Callable[[BaseException], bool] | None = None,
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """Retry an async callable with jittered exponential backoff.
+
+    Attempt ``n`` (from zero) that raises one of ``exceptions`` waits
+    ``base * factor**n`` seconds, scaled by up to ``jitter`` either way, before
+    trying again. ``retry_if`` narrows which of those errors are worth retrying;
+    anything else, or the error from the final attempt, propagates.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            for attempt in range(max_tries):
+                try:
+                    return await func(*args, **kwargs)
+                except exceptions as exc:
+                    if attempt + 1 >= max_tries or (retry_if and not retry_if(exc)):
+                        raise
+                    delay = base * factor**attempt
+                    # Jitter only spreads retries out; it needs no cryptographic randomness
+                    await asyncio.sleep(delay * random.uniform(1 - jitter, 1 + jitter))  # noqa: S311
+            raise AssertionError("unreachable")  # pragma: no cover
+
+        return wrapper
+
+    return decorator
+
+
+__all__ = ["RateLimiter", "backoff_on"]
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import time
+from pathlib import Path
+
+import pytest
+
+from folios_v2.utils.json_cache import JsonDiskCache
+
+
+def test_json_cache_round_trip(tmp_path: Path) -> None:
+    cache = JsonDiskCache(tmp_path / "cache", ttl=60)
+    key = JsonDiskCache.key("list_batches", {"limit": 5})
+
+    assert cache.get(key) is None
+    cache.set(key, [{"id": "batch_1", "status": "in_progress"}])
+    assert cache.get(key) == [{"id": "batch_1", "status": "in_progress"}]
+
+
+def test_json_cache_key_is_stable_and_distinct() -> None:
+    assert JsonDiskCache.key("get", "batch_1") == JsonDiskCache.key("get", "batch_1")
+    assert JsonDiskCache.key("get", "batch_1") != JsonDiskCache.key("get", "batch_2")
+
+
+def test_json_cache_expires_only_non_permanent_entries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = JsonDiskCache(tmp_path, ttl=10)
+    cache.set("running", {"status": "in_progress"})
+    cache.set("done", {"status": "completed"}, permanent=True)
+
+    later = time.time() + 60
+    monkeypatch.setattr(time, "time", lambda: later)
+
+    assert cache.get("running") is None
+    assert cache.get("done") == {"status": "completed"}
+
+
+def test_json_cache_ignores_corrupt_entries(tmp_path: Path) -> None:
+    cache = JsonDiskCache(tmp_path)
+    (tmp_path / "broken.json").write_text("{not json", encoding="utf-8")
+
+    assert cache.get("broken") is None
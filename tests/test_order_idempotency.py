@@ -12,7 +12,11 @@ from folios_v2.domain import Order
 from folios_v2.domain.enums import ProviderId
 from folios_v2.domain.trading import OrderAction, OrderStatus
 from folios_v2.domain.types import OrderId, StrategyId
-from folios_v2.utils.order_idempotency import add_order_if_new, build_order_idempotency_key
+from folios_v2.utils.order_idempotency import (
+    add_order_if_new,
+    build_order_idempotency_key,
+    matches_existing_order,
+)
 
 
 def _utc_now() -> datetime:
@@ -91,3 +95,26 @@ async def test_add_order_if_new_detects_duplicate_order() -> None:
 
     assert added is False
     assert len(repo.orders) == 1
+
+
+def test_matches_existing_order_uses_tolerances_and_cutoff() -> None:
+    existing = _build_order("10", "100")
+    near = existing.model_copy(
+        update={
+            "id": OrderId(uuid4()),
+            "limit_price": Decimal("100.005"),
+            "metadata": {},
+        }
+    )
+    far = near.model_copy(update={"limit_price": Decimal("101")})
+
+    assert matches_existing_order(near, [existing]) is True
+    assert matches_existing_order(far, [existing]) is False
+    assert (
+        matches_existing_order(
+            near,
+            [existing],
+            lookback_cutoff=existing.placed_at + timedelta(seconds=1),
+        )
+        is False
+    )
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from folios_v2.utils.retry import RateLimiter, backoff_on
+
+
+class TransientError(Exception):
+    pass
+
+
+@pytest.mark.asyncio
+async def test_backoff_on_retries_until_success() -> None:
+    calls = 0
+
+    @backoff_on(TransientError, max_tries=4, base=0.001)
+    async def _flaky() -> str:
+        nonlocal calls
+        calls += 1
+        if calls < 3:
+            raise TransientError
+        return "ok"
+
+    assert await _flaky() == "ok"
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_backoff_on_gives_up_after_max_tries() -> None:
+    calls = 0
+
+    @backoff_on(TransientError, max_tries=3, base=0.001)
+    async def _failing() -> None:
+        nonlocal calls
+        calls += 1
+        raise TransientError
+
+    with pytest.raises(TransientError):
+        await _failing()
+    assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_backoff_on_skips_errors_rejected_by_retry_if() -> None:
+    calls = 0
+
+    @backoff_on(TransientError, base=0.001, retry_if=lambda exc: False)
+    async def _failing() -> None:
+        nonlocal calls
+        calls += 1
+        raise TransientError
+
+    with pytest.raises(TransientError):
+        await _failing()
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_out_bursts() -> None:
+    limiter = RateLimiter(max_requests=2, burst_period=0.1)
+
+    started = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+    elapsed = time.monotonic() - started
+
+    # Five acquisitions at two per window need at least two full windows
+    assert elapsed >= 0.2
+
+
+def test_rate_limiter_rejects_empty_window() -> None:
+    with pytest.raises(ValueError):
+        RateLimiter(max_requests=0)
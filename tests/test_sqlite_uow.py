@@ -6,6 +6,8 @@ from decimal import Decimal
 from pathlib import Path
 from uuid import uuid4
 
+from sqlalchemy import text
+
 from folios_v2.domain import (
     ExecutionMode,
     ExecutionTask,
@@ -121,6 +123,68 @@ def test_sqlite_portfolio_position_order(tmp_path: Path) -> None:
     assert orders and orders[0].symbol == "GOOG"
 
 
+def test_sqlite_add_many_positions_and_orders(tmp_path: Path) -> None:
+    factory = create_sqlite_unit_of_work_factory(_db_url(tmp_path))
+    strategy_id = StrategyId(uuid4())
+    provider = ProviderId.OPENAI
+    symbols = ("GOOG", "MSFT", "AAPL")
+
+    strategy = Strategy(
+        id=strategy_id,
+        name="Bulk",
+        prompt="Analyze",
+        tickers=symbols,
+        status=StrategyStatus.ACTIVE,
+    )
+    positions = [
+        Position(
+            id=PositionId(uuid4()),
+            strategy_id=strategy_id,
+            provider_id=provider,
+            symbol=symbol,
+            side=PositionSide.LONG,
+            quantity=Decimal("5"),
+            average_price=Decimal("100"),
+        )
+        for symbol in symbols
+    ]
+    orders = [
+        Order(
+            id=OrderId(uuid4()),
+            strategy_id=strategy_id,
+            provider_id=provider,
+            symbol=symbol,
+            action=OrderAction.BUY,
+            quantity=Decimal("5"),
+            limit_price=Decimal("100"),
+        )
+        for symbol in symbols
+    ]
+
+    async def _store() -> None:
+        async with factory() as uow:
+            await uow.strategy_repository.upsert(strategy)
+            await uow.position_repository.add_many(positions)
+            await uow.order_repository.add_many(orders)
+            await uow.commit()
+
+    asyncio.run(_store())
+
+    async def _load() -> tuple[list[Position], list[Order]]:
+        async with factory() as uow:
+            loaded_positions = await uow.position_repository.list_open(strategy_id, provider)
+            loaded_orders = await uow.order_repository.list_recent(
+                strategy_id,
+                limit=10,
+                provider_id=provider,
+            )
+            return list(loaded_positions), list(loaded_orders)
+
+    loaded_positions, loaded_orders = asyncio.run(_load())
+    assert sorted(p.symbol for p in loaded_positions) == sorted(symbols)
+    assert sorted(o.symbol for o in loaded_orders) == sorted(symbols)
+
+
 def test_sqlite_requests_tasks_and_logs(tmp_path: Path) -> None:
     factory = create_sqlite_unit_of_work_factory(_db_url(tmp_path))
     strategy = Strategy(
@@ -185,3 +249,22 @@ def test_sqlite_requests_tasks_and_logs(tmp_path: Path) -> None:
     assert updated_request is not None
     assert updated_request.lifecycle_state is LifecycleState.SUCCEEDED
     assert log_count == 1
+
+
+def test_sqlite_migrations_index_execution_tasks(tmp_path: Path) -> None:
+    factory = create_sqlite_unit_of_work_factory(_db_url(tmp_path))
+
+    async def _indexes() -> tuple[set[str], list[int]]:
+        async with factory() as uow:
+            session = uow._session
+            index_rows = await session.execute(
+                text("SELECT name FROM sqlite_master WHERE type = 'index'")
+            )
+            version_rows = await session.execute(
+                text("SELECT version FROM folios_schema_migrations ORDER BY version")
+            )
+            return {row[0] for row in index_rows}, [row[0] for row in version_rows]
+
+    indexes, versions = asyncio.run(_indexes())
+    assert "ix_execution_tasks_request_created" in indexes
+    assert versions == [1, 2]